@@ -0,0 +1,178 @@
+import argparse
+import contextlib
+import io
+import random
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import generate_recipe as gr
+
+# -----------------------------
+# Synthetic corpus - אותו פורמט כמו קבצי ה-txt האמיתיים
+# -----------------------------
+WORDS_EN = ("chicken egg flour panko sesame oil salt pepper onion garlic tomato paprika "
+            "slice dip fry bake stir heat coat press golden crispy tray bowl plate minutes").split()
+WORDS_HE = ("עוף ביצה קמח פירורי שומשום שמן מלח פלפל בצל שום עגבנייה פפריקה "
+            "פורסים טובלים מטגנים אופים מערבבים מחממים מצפים לוחצים זהוב פריך מגש קערה צלחת דקות").split()
+HEADERS = {
+    "en": ("Ingredients", "Instructions", "Description", "Tip:"),
+    "he": ("מצרכים", "אופן ההכנה", "תיאור", "טיפ:"),
+}
+
+
+def sentence(rng, words, n):
+    return " ".join(rng.choice(words) for _ in range(n)).capitalize() + "."
+
+
+def synthetic_recipe(rng, lang, index, ingredients=12, steps=8, lines_per_step=4, tip_every=2):
+    words = WORDS_HE if lang == "he" else WORDS_EN
+    ing_header, inst_header, desc_header, tip = HEADERS[lang]
+    lines = [f"{sentence(rng, words, 3)[:-1]} {index}", "", ing_header, ""]
+    lines += [f"- {rng.randint(1, 4)} {sentence(rng, words, 4)}" for _ in range(ingredients)]
+    lines += ["", inst_header, ""]
+    for step in range(steps):
+        lines.append(sentence(rng, words, 3))
+        lines += [sentence(rng, words, 14) for _ in range(lines_per_step)]
+        if tip_every and step % tip_every == 0:
+            lines.append(f"{tip} {sentence(rng, words, 12)}")
+        lines.append("")
+    lines += [desc_header, "", sentence(rng, words, 30), sentence(rng, words, 20)]
+    return "\n".join(lines)
+
+
+def make_corpus(out_dir, recipes=100, seed=1, **shape):
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(recipes):
+        for lang in ("en", "he"):
+            path = out_dir / f"Recipe{i:06d}_{lang}.txt"
+            path.write_text(synthetic_recipe(rng, lang, i, **shape), encoding="utf-8")
+    return out_dir
+
+
+# -----------------------------
+# Stages
+# -----------------------------
+# הקורפוס עובר בחבילות: כל שלב נמדד על החבילה והתוצאות נזרקות לפני החבילה הבאה,
+# כך שהזיכרון (וה-peak שמדווח) לא גדל עם גודל הקורפוס
+BATCH_SIZE = 500
+
+
+def timed(name, totals, fn, trace_memory=False):
+    # totals[name] = [סך השניות, ה-peak הגדול ביותר בין החבילות]
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    total = totals.setdefault(name, [0.0, None])
+    total[0] += elapsed
+    if peak is not None:
+        total[1] = max(total[1] or 0, peak)
+    return value
+
+
+def run_batch(corpus, out_dir, names, totals, trace_memory=False):
+    parsed = timed("parse_recipe_file", totals, lambda: [
+        (name, lang, gr.parse_recipe_file(Path(corpus) / f"{name}_{lang}.txt"))
+        for name in names for lang in ("en", "he")
+    ], trace_memory)
+
+    timed("build_instruction_html", totals, lambda: [
+        gr.build_instruction_html(inst) for _, _, (_, _, inst, _) in parsed
+    ], trace_memory)
+
+    pages = timed("build_html", totals, lambda: [
+        (f"{name}_{lang}.html", gr.build_html(t, ing, inst, desc, lang=lang, recipe_name=name,
+                                              stylesheet=f"css/recipe.{lang}.css"))
+        for name, lang, (t, ing, inst, desc) in parsed
+    ], trace_memory)
+
+    pages += timed("build_print", totals, lambda: [
+        (f"{name}_{lang}_print.html", gr.build_print(t, ing, inst, desc, lang=lang, recipe_name=name,
+                                                     stylesheet=f"css/print.{lang}.css"))
+        for name, lang, (t, ing, inst, desc) in parsed
+    ], trace_memory)
+
+    timed("write", totals, lambda: [
+        (out_dir / filename).write_text(html, encoding="utf-8") for filename, html in pages
+    ], trace_memory)
+
+
+def run(corpus, out_dir, trace_memory=False, full_build=False, jobs=None, batch=BATCH_SIZE):
+    names = sorted(p.name[:-len("_en.txt")] for p in Path(corpus).glob("*_en.txt"))
+    n = len(names)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    totals = {}
+    for start in range(0, n, batch):
+        run_batch(corpus, out_dir, names[start:start + batch], totals, trace_memory)
+
+    if full_build:
+        # בנייה מלאה מקצה לקצה (כולל manifest ו-process pool) על עותק של הקורפוס
+        build_root = out_dir / "full"
+        shutil.copytree(corpus, build_root, dirs_exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            timed(f"build_all (jobs={jobs or 'auto'})", totals,
+                  lambda: gr.build_all(build_root, jobs=jobs, force=True), trace_memory)
+
+    results = [(name, elapsed, n / elapsed if elapsed else float("inf"), peak)
+               for name, (elapsed, peak) in totals.items()]
+    return n, results
+
+
+def report(n, results):
+    print(f"\n📊 {n} recipes (EN + HE)")
+    print(f"{'stage':<28}{'seconds':>10}{'recipes/s':>14}{'peak MB':>10}")
+    for name, elapsed, rate, peak in results:
+        peak_text = f"{peak / 1e6:.1f}" if peak is not None else "-"
+        print(f"{name:<28}{elapsed:>10.3f}{rate:>14.0f}{peak_text:>10}")
+    render = sum(e for name, e, _, _ in results if name in ("parse_recipe_file", "build_html", "build_print"))
+    print(f"{'parse + render':<28}{render:>10.3f}{n / render if render else 0:>14.0f}")
+    # ru_maxrss ב-Linux הוא ב-KB
+    print(f"max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the recipe generator on a synthetic corpus.")
+    parser.add_argument("-n", "--recipes", type=int, default=100, help="number of synthetic recipes (default: 100)")
+    parser.add_argument("--steps", type=int, default=8, help="instruction steps per recipe")
+    parser.add_argument("--lines-per-step", type=int, default=4)
+    parser.add_argument("--tip-every", type=int, default=2, help="add a TIP line every N steps (0 = none)")
+    parser.add_argument("--corpus", help="reuse (or create) the corpus in this directory")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="measure the Python heap peak of each stage (slower)")
+    parser.add_argument("--full-build", action="store_true", help="also time an end-to-end build_all")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="workers for --full-build")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE,
+                        help=f"recipes per timed batch; bounds memory (default: {BATCH_SIZE})")
+    args = parser.parse_args(argv)
+
+    tmp = Path(tempfile.mkdtemp(prefix="recipe-bench-"))
+    try:
+        corpus = Path(args.corpus) if args.corpus else tmp / "corpus"
+        if not any(corpus.glob("*_en.txt")):
+            started = time.perf_counter()
+            make_corpus(corpus, args.recipes, seed=args.seed, steps=args.steps,
+                        lines_per_step=args.lines_per_step, tip_every=args.tip_every)
+            print(f"🧪 Generated {args.recipes} recipes in {time.perf_counter() - started:.1f}s ({corpus})")
+        n, results = run(corpus, tmp / "out", trace_memory=args.trace_memory,
+                         full_build=args.full_build, jobs=args.jobs, batch=max(1, args.batch))
+        report(n, results)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,20 @@
+import base64
+import contextlib
+import filecmp
+import functools
+import hashlib
+import inspect
+import io
+import json
+import os
 import re
+import shutil
+import struct
+import sys
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
 from pathlib import Path
 
 # -----------------------------
@@ -37,6 +53,32 @@ def parse_steps(block):
     return [line.rstrip() for line in lines]
 
 
+# כותרות הסקשנים בשתי השפות
+SECTION_HEADERS = {
+    "Ingredients": "ingredients", "מצרכים": "ingredients",
+    "Instructions": "instructions", "אופן ההכנה": "instructions",
+    "Description": "description", "תיאור": "description",
+}
+
+
+def split_sections(lines):
+    # מעבר אחד על כל השורות במקום extract_block נפרד לכל סקשן.
+    # כמו extract_block: רק ההופעה הראשונה של כל סקשן נאספת, כותרת של סקשן אחר עוצרת אותו,
+    # וחזרה על הכותרת של אותו סקשן מדולגת.
+    sections = {}
+    current = None
+    for line in lines:
+        section = SECTION_HEADERS.get(line.strip())
+        if section is None:
+            if current is not None:
+                current.append(line)
+        elif section not in sections:
+            current = sections[section] = []
+        elif current is not sections[section]:
+            current = None
+    return {name: "\n".join(collected).strip() for name, collected in sections.items()}
+
+
 # -----------------------------
 # HTML builder helpers
 # -----------------------------
@@ -77,37 +119,39 @@ def build_instruction_html(instructions, lang="en"):
 
     return "\n".join(html)
 
+
+def build_hero_tag(title, hero_image=None, hero_variants=None, hero_info=None):
+    if not hero_image:
+        return ""
+    # מידות אמיתיות (בלי קפיצות ב-layout) + placeholder מטושטש עד שהתמונה נטענת
+    attrs = ""
+    if hero_info:
+        attrs += f' width="{hero_info["width"]}" height="{hero_info["height"]}"'
+        if hero_info.get("placeholder"):
+            attrs += f' style="background: url({hero_info["placeholder"]}) center / cover"'
+    # ה-hero הוא ה-LCP של הדף (מעל הקו): נטען מיד ובעדיפות גבוהה, רק הפענוח לא חוסם
+    attrs += ' loading="eager" fetchpriority="high" decoding="async"'
+    if not hero_variants:
+        return f'<img class="hero" src="{hero_image}" alt="{title}"{attrs}>'
+
+    # hero_variants: [(mime, [(url, width), ...]), ...] - הפורמט האחרון הוא ה-JPEG ל-<img>
+    def srcset(files):
+        return ", ".join(f"{url} {width}w" for url, width in files)
+
+    *sources, (_, fallback) = hero_variants
+    src = max((f for f in fallback if f[1] <= HERO_FALLBACK_WIDTH), key=lambda f: f[1], default=fallback[0])[0]
+    tags = [f'<source type="{mime}" srcset="{srcset(files)}" sizes="{HERO_SIZES}">' for mime, files in sources]
+    tags.append(f'<img class="hero" src="{src}" srcset="{srcset(fallback)}" sizes="{HERO_SIZES}" alt="{title}"{attrs}>')
+    return "<picture>\n" + "\n".join(tags) + "\n</picture>"
+
 # -----------------------------
-# HTML builder
+# CSS
 # -----------------------------
-def build_html(title, ingredients, instructions, description,
-               lang="en", time_text="40 minutes", level_text="Easy",
-               hero_image=None, file_other="#"):
+def build_css(lang="en"):
     is_he = lang == "he"
-    direction = "rtl" if is_he else "ltr"
     font_family = "Alef, system-ui, sans-serif" if is_he else "system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif"
 
-    hero_tag = f'<img class="hero" src="{hero_image}" alt="{title}">' if hero_image else ""
-
-    label_recipe = "מתכון" if is_he else "RECIPE"
-    label_time = "זמן" if is_he else "Time"
-    label_servings = "מנות" if is_he else "Servings"
-    label_level = "רמת קושי" if is_he else "Skill Level"
-    label_ingredients = "מצרכים" if is_he else "Ingredients"
-    label_instructions = "הוראות הכנה" if is_he else "Instructions"
-    subtitle = "מנה קלאסית שקל להכין בבית." if is_he else "A classic dish you can easily make at home."
-    lang_switch_text = (
-        f'<img src="flag_gb.png" alt="English"> English' if is_he else f'<img src="flag_il.png" alt="עברית"> עברית'
-    )
-
-    html = f"""<!DOCTYPE html>
-<html lang="{lang}" dir="{direction}">
-<head>
-<meta charset="UTF-8">
-<title>{title}</title>
-
-<style>
-:root {{
+    return f""":root {{
     --main-orange: #d35400;
     --ingredient-bullet: #d35400;
     --section-bg: #fffaf0;
@@ -311,76 +355,13 @@ ol li::before {{
     margin-top: 24px;  /* רווח מהתוכן שמעל */
     background: transparent; /* אין רקע חזק שמכסה את העמוד */
 }}
-</style>
-</head>
-
-<body>
-<div class="page">
-
-<button class="print-button" onclick="window.open('{recipe_name}_{lang}_print.html', '_blank')">🖨️ {'הדפסה' if is_he else 'Print'}</button>
-
-<div class="lang-switch">
-    <a href="{file_other}">{lang_switch_text}</a>
-</div>
-
-{hero_tag}
-
-<div class="header-bar"></div>
-
-<div class="header">
-    <div class="tag">{label_recipe}</div>
-    <h1>{title}</h1>
-    <div class="subtitle">{subtitle}</div>
-    <div class="description">{description}</div>
-
-    <div class="meta">
-        <div class="meta-item"><span class="icon">🕒</span> <b>{label_time}:</b> {time_text}</div>
-        <div class="meta-item"><span class="icon">🍽️</span> <b>{label_servings}:</b> 6</div>
-        <div class="meta-item"><span class="icon">🧑‍🍳</span> <b>{label_level}:</b> {level_text}</div>
-    </div>
-</div>
-
-<div class="section-box">
-    <h2>{label_ingredients}</h2>
-    <ul>
-        {''.join(f'<li>{i}</li>' for i in ingredients)}
-    </ul>
-</div>
-
-<div class="divider"></div>
-
-<div class="section-box">
-    <h2>{label_instructions}</h2>
-    <ol>
-        {build_instruction_html(instructions)}
-    </ol>
-</div>
-
-<div class="footer">
-    {"כל הזכויות שמורות לתומר הלל לב ©" if is_he else "© 2026 Tomer Hillel Lev. All rights reserved."}
-</div>
-</body>
-</html>
 """
-    return html
 
-# -----------------------------
-# Print version
-# -----------------------------
-def build_print(title, ingredients, instructions, description, lang="en", recipe_name="Recipe"):
+
+def build_print_css(lang="en"):
     is_he = lang == "he"
-    direction = "rtl" if is_he else "ltr"
-    label_ingredients = "מצרכים" if is_he else "Ingredients"
-    label_instructions = "הוראות הכנה" if is_he else "Instructions"
-    print_text = "הדפסה" if is_he else "Print"
 
-    html = f"""<!DOCTYPE html>
-<html lang="{lang}" dir="{direction}">
-<head>
-<meta charset="UTF-8">
-<title>{title} – Print</title>
-<style>
-:root {{
+    return f""":root {{
     --main-orange: #d35400;
     --ingredient-bullet: #d35400;
     --section-bg: #fffaf0;
@@ -526,19 +507,197 @@ ol li::before {{
         display: none;          /* לא להראות תמונה בהדפסה */
     }}
 }}
-</style>
+"""
+
+
+def build_style_tag(css, stylesheet=None, critical=None):
+    # stylesheet = קובץ CSS משותף (ראה write_stylesheets); בלעדיו ה-CSS נכנס לתוך הדף.
+    # critical = ה-CSS של מה שנראה בטעינה הראשונה: נכנס לדף, והקובץ המלא נטען בלי לחסום את הציור
+    if stylesheet and critical:
+        return (f"<style>\n{critical}</style>\n"
+                f'<link rel="preload" href="{stylesheet}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+                f'<noscript><link rel="stylesheet" href="{stylesheet}"></noscript>')
+    if stylesheet:
+        return f'<link rel="stylesheet" href="{stylesheet}">'
+    return f"<style>\n{css}</style>"
+
+# -----------------------------
+# Page templates
+# -----------------------------
+def slot(name):
+    # סימון של חריץ דינמי בתוך תבנית
+    return f"\0{name}\0"
+
+
+class PageTemplate:
+    # תבנית מקומפלת: החלקים הקבועים (CSS, תוויות, כיוון) מחושבים פעם אחת,
+    # וברינדור רק ממלאים את החריצים
+    __slots__ = ("parts", "slots")
+
+    def __init__(self, text):
+        self.parts = text.split("\0")
+        # באינדקסים האי-זוגיים יושבים שמות החריצים
+        self.slots = [(i, self.parts[i]) for i in range(1, len(self.parts), 2)]
+
+    def render(self, **values):
+        parts = self.parts.copy()
+        for i, name in self.slots:
+            parts[i] = values[name]
+        return "".join(parts)
+
+
+def ingredients_html(ingredients):
+    return "".join(f"<li>{i}</li>" for i in ingredients)
+
+
+def render_fragments(title, ingredients, instructions, description):
+    # החלקים של המתכון שמשותפים לכל גרסאות הפלט - מחושבים פעם אחת לכל שפה
+    return {
+        "title": title,
+        "description": description,
+        "ingredients": ingredients_html(ingredients),
+        "instructions": build_instruction_html(instructions),
+    }
+
+
+# -----------------------------
+# HTML builder
+# -----------------------------
+@functools.lru_cache(maxsize=None)
+def compile_html_template(lang="en", stylesheet=None, flag=None, markup_only=False):
+    # markup_only: בלי CSS בכלל - בשביל page_vocabulary, שממנה נגזר ה-CSS עצמו
+    is_he = lang == "he"
+    # flag = הדגל של השפה השנייה (כתובת ב-assets, יחסית לשורש)
+    flag = flag or ("flag_gb.png" if is_he else "flag_il.png")
+    direction = "rtl" if is_he else "ltr"
+    style_tag = "" if markup_only else build_style_tag(
+        None if stylesheet else page_css("recipe", lang), stylesheet, critical_css(lang) if stylesheet else None)
+
+    label_recipe = "מתכון" if is_he else "RECIPE"
+    label_time = "זמן" if is_he else "Time"
+    label_servings = "מנות" if is_he else "Servings"
+    label_level = "רמת קושי" if is_he else "Skill Level"
+    label_ingredients = "מצרכים" if is_he else "Ingredients"
+    label_instructions = "הוראות הכנה" if is_he else "Instructions"
+    subtitle = "מנה קלאסית שקל להכין בבית." if is_he else "A classic dish you can easily make at home."
+    root_url = slot("root_url")
+    lang_switch_text = (
+        f'<img src="{root_url}{flag}" alt="English"> English' if is_he else f'<img src="{root_url}{flag}" alt="עברית"> עברית'
+    )
+
+    return PageTemplate(f"""<!DOCTYPE html>
+<html lang="{lang}" dir="{direction}">
+<head>
+<meta charset="UTF-8">
+<title>{slot("title")}</title>
+
+{style_tag}
+</head>
+
+<body>
+<div class="page">
+
+<button class="print-button" onclick="window.open('{slot("recipe_name")}_{lang}_print.html', '_blank')">🖨️ {'הדפסה' if is_he else 'Print'}</button>
+
+<div class="lang-switch">
+    <a href="{slot("file_other")}">{lang_switch_text}</a>
+</div>
+
+{slot("hero_tag")}
+
+<div class="header-bar"></div>
+
+<div class="header">
+    <div class="tag">{label_recipe}</div>
+    <h1>{slot("title")}</h1>
+    <div class="subtitle">{subtitle}</div>
+    <div class="description">{slot("description")}</div>
+
+    <div class="meta">
+        <div class="meta-item"><span class="icon">🕒</span> <b>{label_time}:</b> {slot("time_text")}</div>
+        <div class="meta-item"><span class="icon">🍽️</span> <b>{label_servings}:</b> 6</div>
+        <div class="meta-item"><span class="icon">🧑‍🍳</span> <b>{label_level}:</b> {slot("level_text")}</div>
+    </div>
+</div>
+
+<div class="section-box">
+    <h2>{label_ingredients}</h2>
+    <ul>
+        {slot("ingredients")}
+    </ul>
+</div>
+
+<div class="divider"></div>
+
+<div class="section-box">
+    <h2>{label_instructions}</h2>
+    <ol>
+        {slot("instructions")}
+    </ol>
+</div>
+
+<div class="footer">
+    {"כל הזכויות שמורות לתומר הלל לב ©" if is_he else "© 2026 Tomer Hillel Lev. All rights reserved."}
+</div>
+{service_worker_tag(root_url)}
+</body>
+</html>
+""")
+
+
+def render_html_page(fragments, page):
+    return compile_html_template(page["lang"], page["stylesheets"].get("recipe"), page.get("flag")).render(
+        **fragments,
+        time_text=page["time_text"],
+        level_text=page["level_text"],
+        hero_tag=page["hero_tag"],
+        file_other=page["file_other"],
+        recipe_name=page["recipe_name"],
+        root_url=page["root_url"],
+    )
+
+
+def build_html(title, ingredients, instructions, description,
+               lang="en", time_text="40 minutes", level_text="Easy",
+               hero_image=None, file_other="#", recipe_name="Recipe", root_url="",
+               hero_variants=None, stylesheet=None, hero_info=None):
+    page = {
+        "lang": lang, "stylesheets": {"recipe": stylesheet}, "time_text": time_text, "level_text": level_text,
+        "hero_tag": build_hero_tag(title, hero_image, hero_variants, hero_info), "file_other": file_other,
+        "recipe_name": recipe_name, "root_url": root_url,
+    }
+    return render_html_page(render_fragments(title, ingredients, instructions, description), page)
+
+# -----------------------------
+# Print version
+# -----------------------------
+@functools.lru_cache(maxsize=None)
+def compile_print_template(lang="en", stylesheet=None, markup_only=False):
+    is_he = lang == "he"
+    direction = "rtl" if is_he else "ltr"
+    style_tag = "" if markup_only else build_style_tag(None if stylesheet else page_css("print", lang), stylesheet)
+    label_ingredients = "מצרכים" if is_he else "Ingredients"
+    label_instructions = "הוראות הכנה" if is_he else "Instructions"
+    print_text = "הדפסה" if is_he else "Print"
+
+    return PageTemplate(f"""<!DOCTYPE html>
+<html lang="{lang}" dir="{direction}">
+<head>
+<meta charset="UTF-8">
+<title>{slot("title")} – Print</title>
+{style_tag}
 </head>
 <body>
 
-<h1>{title}</h1>
-<p class="description">{description}</p>
+<h1>{slot("title")}</h1>
+<p class="description">{slot("description")}</p>
 
 <button class="print-button" onclick="window.print()">🖨️ {print_text}</button>
 
 <div class="section-box">
     <h2>{label_ingredients}</h2>
     <ul>
-        {''.join(f'<li>{i}</li>' for i in ingredients)}
+        {slot("ingredients")}
     </ul>
 </div>
 
@@ -547,7 +706,7 @@ ol li::before {{
 <div class="section-box">
     <h2>{label_instructions}</h2>
     <ol>
-        {build_instruction_html(instructions)}
+        {slot("instructions")}
     </ol>
 </div>
 <div class="footer">
@@ -555,89 +714,2364 @@ ol li::before {{
 </div>
 </body>
 </html>
-"""
-    return html
+""")
+
+
+def render_print_page(fragments, page):
+    return compile_print_template(page["lang"], page["stylesheets"].get("print")).render(**fragments)
+
+
+def build_print(title, ingredients, instructions, description, lang="en", recipe_name="Recipe",
+                stylesheet=None):
+    page = {"lang": lang, "stylesheets": {"print": stylesheet}, "recipe_name": recipe_name}
+    return render_print_page(render_fragments(title, ingredients, instructions, description), page)
+
+
+# -----------------------------
+# Output variants
+# -----------------------------
+# כל גרסת פלט של מתכון: (סיומת שם הקובץ, פונקציה שמקבלת את הקטעים המשותפים + הקשר הדף).
+# גרסה חדשה (AMP, אימייל...) = עוד שורה כאן, בלי לרנדר שוב את המצרכים וההוראות.
+OUTPUT_VARIANTS = [
+    ("html", "", render_html_page),
+    ("print", "_print", render_print_page),
+]
 
 # -----------------------------
 # Recipe parsing
 # -----------------------------
+def parse_recipe_text(text):
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    title = (lines[0].splitlines() or [""])[0].strip()
+
+    blocks = split_sections(lines)
+    ingredients = parse_list(blocks.get("ingredients", ""))
+    # הבלוק כבר מנורמל, אין צורך לעבור שוב ב-parse_steps
+    instructions = [line.rstrip() for line in blocks.get("instructions", "").split("\n")]
+    description = blocks.get("description", "")
+
+    return title, ingredients, instructions, description
+
+
 def parse_recipe_file(path):
-    text = Path(path).read_text(encoding="utf-8")
-    title = text.splitlines()[0].strip()
+    return parse_recipe_text(Path(path).read_text(encoding="utf-8"))
 
-    ingredients_block = extract_block(
-        text,
-        ["Ingredients", "מצרכים"],
-        ["Instructions", "אופן ההכנה", "Description", "תיאור"]
-    )
 
-    instructions_block = extract_block(
-        text,
-        ["Instructions", "אופן ההכנה"],
-        ["Ingredients", "מצרכים", "Description", "תיאור"]
-    )
+# שורות "Time: ..." / "זמן: ..." בין הכותרת לסקשן הראשון (לא חובה) - גוברות על ברירת המחדל
+META_KEYS = {
+    "Time": "time", "זמן": "time",
+    "Level": "level", "Skill Level": "level", "רמת קושי": "level",
+}
 
-    description_block = extract_block(
-        text,
-        ["Description", "תיאור"],
-        ["Ingredients", "מצרכים", "Instructions", "אופן ההכנה"]
-    )
 
-    ingredients = parse_list(ingredients_block)
-    instructions = parse_steps(instructions_block)
-    description = description_block.strip()
+def parse_recipe_meta(text):
+    meta = {}
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n")[1:]:
+        if line.strip() in SECTION_HEADERS:
+            break
+        key, sep, value = line.partition(":")
+        if sep and key.strip() in META_KEYS and value.strip():
+            meta.setdefault(META_KEYS[key.strip()], value.strip())
+    return meta
+
+
+# -----------------------------
+# Recipe model + parse cache
+# -----------------------------
+# להעלות כשמשנים את הפורמט של ה-cache; שינוי בקוד הפרסור עצמו נתפס אוטומטית (ראה parser_version)
+PARSER_VERSION = 2
+PARSE_CACHE_DIR = ".build-cache/parsed"
+
+
+@dataclass(slots=True)
+class Recipe:
+    title: str
+    lang: str
+    ingredients: list
+    steps: list
+    description: str
+    time: str = ""
+    level: str = ""
+    image: str = None
+
+
+@functools.lru_cache(maxsize=None)
+def parser_version():
+    source = "".join(inspect.getsource(f) for f in (parse_list, split_sections, parse_recipe_text,
+                                                   parse_recipe_meta))
+    source += repr(sorted(SECTION_HEADERS.items())) + repr(sorted(META_KEYS.items()))
+    return f"{PARSER_VERSION}-{hashlib.sha256(source.encode('utf-8')).hexdigest()[:8]}"
+
+
+def load_recipe(path, lang="en", cache_dir=None, time="", level="", image=None):
+    # ה-cache מפתחו hash של קובץ המקור + גרסת הפרסור: שינוי בתבנית בלבד לא מפרסר שוב
+    data = Path(path).read_bytes()
+    cached = fields = None
+    if cache_dir is not None:
+        cached = Path(cache_dir) / f"{parser_version()}-{hashlib.sha256(data).hexdigest()}.json"
+        try:
+            fields = json.loads(cached.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            fields = None
+
+    if fields is None:
+        text = data.decode("utf-8")
+        fields = [*parse_recipe_text(text), parse_recipe_meta(text)]
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_name(f".{cached.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(fields, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, cached)
+
+    # time / level שמגיעים מבחוץ הם ברירת מחדל; מה שכתוב בקובץ המתכון גובר
+    title, ingredients, steps, description, meta = fields
+    return Recipe(title, lang, ingredients, steps, description,
+                  time=meta.get("time", time), level=meta.get("level", level), image=image)
+
+# -----------------------------
+# Recipe discovery
+# -----------------------------
+IMAGE_SUFFIXES = [".png", ".jpg", ".jpeg"]
+# tests/ מכיל קורפוס של קבצי מתכון לבדיקות (tests/golden) - לא חלק מספר המתכונים
+SKIP_DIRS = {"__pycache__", "tests"}
+
+# זמן ורמת קושי למתכון שלא כתב אותם בעצמו (ראה META_KEYS; אפשר לשנות ב---time-en וכו')
+DEFAULT_META = {
+    "en": {"time": "45 minutes", "level": "Easy–Intermediate"},
+    "he": {"time": "45 דקות", "level": "קל-מתקדם"},
+}
+
+
+def find_recipes(root="."):
+    # כל מתכון הוא זוג קבצים <name>_en.txt + <name>_he.txt באותה תיקייה
+    recipes = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith("."))
+        names = set(filenames)
+        for filename in sorted(filenames):
+            if not filename.endswith("_en.txt"):
+                continue
+            recipe_name = filename[:-len("_en.txt")]
+            if f"{recipe_name}_he.txt" in names:
+                recipes.append((Path(dirpath), recipe_name))
+            else:
+                print(f"⚠️ חסר {recipe_name}_he.txt ב-{dirpath}, המתכון ידולג.")
+    return recipes
+
+
+def find_image(recipe_dir, recipe_name):
+    # מחפש כל קובץ תמונה עם שם המתכון, בלי קשר לאותיות
+    for file in Path(recipe_dir).glob(f"{recipe_name}.*"):
+        if file.suffix.lower() in IMAGE_SUFFIXES:
+            return file
+    return None
+
+
+# -----------------------------
+# Output
+# -----------------------------
+def write_if_changed(path, data):
+    # כותבים רק אם התוכן שונה ממה שעל הדיסק, דרך קובץ זמני + rename כדי שלא יישאר קובץ חצי כתוב
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+class OutputReport:
+    # אילו קבצי פלט נכתבו, נשארו כמו שהם או נמחקו (בשביל publish ובשביל הסיכום)
+    __slots__ = ("written", "unchanged", "deleted", "minify")
+
+    def __init__(self, minify=False):
+        self.written = []
+        self.unchanged = []
+        self.deleted = []
+        self.minify = minify
+
+    def write(self, path, data):
+        if self.minify:
+            data = minify_output(path, data)
+        if write_if_changed(path, data):
+            self.written.append(Path(path))
+        else:
+            self.unchanged.append(Path(path))
+
+    def delete(self, path):
+        Path(path).unlink()
+        self.deleted.append(Path(path))
+
+    def write_chunks(self, path, chunks):
+        # כמו write, אבל לזרם של חלקים: נכתב לקובץ זמני ומושווה לקיים בלי להחזיק הכל בזיכרון
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                f.write(minify_html(chunk) + "\n" if self.minify else chunk)
+        if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+            tmp.unlink()
+            self.unchanged.append(path)
+        else:
+            os.replace(tmp, path)
+            self.written.append(path)
+
+    def merge(self, other):
+        self.written += other.written
+        self.unchanged += other.unchanged
+        self.deleted += other.deleted
+        return self
+
+    def summary(self):
+        return f"{len(self.written)} written, {len(self.unchanged)} unchanged, {len(self.deleted)} deleted"
 
-    return title, ingredients, instructions, description
 
 # -----------------------------
-# Main - הגדר כאן את פרטי המתכון
-# -----------------------------
-recipe_name = "Shnitzel"
-txt_en = f"{recipe_name}_en.txt"
-txt_he = f"{recipe_name}_he.txt"
-
-# מחפש כל קובץ תמונה עם השם Shnitzel, בלי קשר לאותיות
-for file in Path(".").glob(f"{recipe_name}.*"):
-    if file.suffix.lower() in [".png", ".jpg", ".jpeg"]:
-        image_file = str(file)
-        break
-
-if image_file is None:
-    print(f"⚠️ לא נמצאה תמונה עבור {recipe_name}. המתכון ייווצר בלי תמונה.")
-else:
-    print(f"✅ התמונה שנבחרה: {image_file}")
-
-# זמן ורמת קושי
-time_en, level_en = "45 minutes", "Easy–Intermediate"
-time_he, level_he = "45 דקות", "קל-מתקדם"
-
-# קבצי HTML
-file_en = f"{recipe_name}_en.html"
-file_he = f"{recipe_name}_he.html"
-
-# -----------------------------
-# English
-t, ing, inst, desc = parse_recipe_file(txt_en)
-Path(file_en).write_text(
-    build_html(t, ing, inst, desc, lang="en", time_text=time_en, level_text=level_en,
-               hero_image=image_file, file_other=file_he),
-    encoding="utf-8"
-)
-Path(f"{recipe_name}_en_print.html").write_text(
-    build_print(t, ing, inst, desc, lang="en"),
-    encoding="utf-8"
-)
-
-# Hebrew
-t, ing, inst, desc = parse_recipe_file(txt_he)
-Path(file_he).write_text(
-    build_html(t, ing, inst, desc, lang="he", time_text=time_he, level_text=level_he,
-               hero_image=image_file, file_other=file_en),
-    encoding="utf-8"
-)
-Path(f"{recipe_name}_he_print.html").write_text(
-    build_print(t, ing, inst, desc, lang="he"),
-    encoding="utf-8"
-)
-
-print("✅ HTML + Print HTML created for EN + HE")
\ No newline at end of file
+# Minify + precompress
+# -----------------------------
+COMPRESS_SUFFIXES = {".html", ".css", ".js", ".json", ".svg"}
+CSS_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|/\*.*?\*/|\s+|[{};,]|[^"\'/\s{};,]+|/', re.S)
+STYLE_BLOCK_RE = re.compile(r"(<style>)(.*?)(</style>)", re.S)
+
+
+def minify_css(css):
+    # מוחק הערות ורווחים מיותרים; מחרוזות ("❖") נשארות כמו שהן
+    out = []
+    space = False
+    for token in CSS_TOKEN_RE.findall(css):
+        if token.isspace() or token.startswith("/*"):
+            space = True
+            continue
+        if token in ("{", "}", ";", ","):
+            if token == "}" and out and out[-1] == ";":
+                out.pop()
+            out.append(token)
+        else:
+            if space and out and out[-1] not in ("{", "}", ";", ",") and not out[-1].endswith(":"):
+                out.append(" ")
+            out.append(token)
+        space = False
+    return "".join(out)
+
+
+def minify_html(html):
+    # בלי <pre> בדפים שלנו, אז הזחה ושורות ריקות לא משנות את התצוגה
+    html = STYLE_BLOCK_RE.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), html)
+    lines = (line.strip() for line in html.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def minify_output(path, data):
+    suffix = Path(path).suffix
+    if suffix == ".html":
+        return minify_html(data)
+    if suffix == ".css":
+        return minify_css(data)
+    return data
+
+
+def load_brotli():
+    # brotli היא תלות אופציונלית - בלעדיה נוצרים רק קבצי .gz
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress_file(path, known_digest=None):
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    brotli = load_brotli()
+    import gzip
+
+    siblings = [(path.with_name(path.name + ".gz"), lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        siblings.append((path.with_name(path.name + ".br"), lambda: brotli.compress(data, quality=11)))
+
+    # קובץ שהתוכן שלו לא השתנה מהדחיסה הקודמת לא נדחס שוב
+    if digest == known_digest and all(s.exists() for s, _ in siblings):
+        return str(path), digest, []
+    return str(path), digest, [str(s) for s, compress in siblings if write_if_changed(s, compress())]
+
+
+def _compress_task(args):
+    return compress_file(*args)
+
+
+def drop_compressed(root, paths, report, manifest):
+    # .gz/.br של קובץ שנמחק או נכתב בלי דחיסה מחזיקים גרסה ישנה (gzip_static היה מגיש אותה)
+    known = manifest.get("compressed", {})
+    for path in list(paths):
+        path = Path(path)
+        known.pop(Path(os.path.relpath(path, root)).as_posix(), None)
+        for suffix in (".gz", ".br"):
+            sibling = path.with_name(path.name + suffix)
+            if sibling.exists():
+                report.delete(sibling)
+
+
+def compress_outputs(root, report, manifest, jobs=None):
+    known = manifest.setdefault("compressed", {})
+
+    def rel(p):
+        return Path(os.path.relpath(p, root)).as_posix()
+
+    drop_compressed(root, report.deleted, report, manifest)
+    candidates = {p for p in (*report.written, *report.unchanged) if p.suffix in COMPRESS_SUFFIXES}
+    tasks = [(p, known.get(rel(p))) for p in sorted(candidates)]
+    if jobs == 1 or len(tasks) <= 1:
+        results = map(_compress_task, tasks)
+        return _record_compressed(results, known, report, rel)
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        results = pool.map(_compress_task, tasks, chunksize=max(1, len(tasks) // 64))
+        return _record_compressed(results, known, report, rel)
+
+
+def _record_compressed(results, known, report, rel):
+    count = 0
+    for path, digest, siblings in results:
+        known[rel(path)] = digest
+        report.written += [Path(s) for s in siblings]
+        count += bool(siblings)
+    return count
+
+
+# -----------------------------
+# Build manifest (בנייה מחדש רק למה שהשתנה)
+# -----------------------------
+# להעלות כשמשנים את מבנה הפלט בלי לשנות את הקוד עצמו
+GENERATOR_VERSION = 1
+MANIFEST_NAME = ".build-manifest.json"
+FLAG_FILES = ["flag_gb.png", "flag_il.png"]
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def generator_digest():
+    # גרסת המחולל + hash של הקוד (התבניות יושבות בתוך הקובץ הזה)
+    source = Path(__file__).read_bytes()
+    return f"{GENERATOR_VERSION}:{hashlib.sha256(source).hexdigest()}"
+
+
+def load_manifest(root="."):
+    path = Path(root) / MANIFEST_NAME
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"files": {}, "recipes": {}}
+    manifest.setdefault("files", {})
+    manifest.setdefault("recipes", {})
+    return manifest
+
+
+def save_manifest(manifest, root="."):
+    write_if_changed(Path(root) / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True))
+
+
+def add_pending(manifest, root, paths):
+    # קבצים שהשתנו מאז ה-publish האחרון (publish מוסיף ל-git רק אותם)
+    pending = set(manifest.get("pending", []))
+    pending.update(Path(os.path.relpath(p, root)).as_posix() for p in paths)
+    manifest["pending"] = sorted(pending)
+
+
+class FileHasher:
+    # hash לפי תוכן, עם קיצור דרך לפי גודל + mtime כדי לא לקרוא שוב תמונות גדולות
+    def __init__(self, known=None, root="."):
+        self.known = dict(known or {})
+        self.root = root
+        self.seen = {}
+
+    def digest(self, path):
+        key = Path(os.path.relpath(path, self.root)).as_posix()
+        if key in self.seen:
+            return self.seen[key]["sha256"]
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        entry = self.known.get(key)
+        if not entry or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+            entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_digest(path)}
+        self.seen[key] = entry
+        return entry["sha256"]
+
+
+def recipe_id(recipe_dir, recipe_name, root="."):
+    return Path(os.path.relpath(Path(recipe_dir) / recipe_name, root)).as_posix()
+
+
+def recipe_outputs(recipe_dir, recipe_name):
+    return [Path(recipe_dir) / f"{recipe_name}_{lang}{suffix}.html"
+            for lang in ("en", "he") for _, suffix, _ in OUTPUT_VARIANTS]
+
+
+def recipe_inputs(recipe_dir, recipe_name, root="."):
+    recipe_dir = Path(recipe_dir)
+    inputs = [recipe_dir / f"{recipe_name}_en.txt", recipe_dir / f"{recipe_name}_he.txt"]
+    image_file = find_image(recipe_dir, recipe_name)
+    if image_file is not None:
+        inputs.append(image_file)
+    inputs += [Path(root) / flag for flag in FLAG_FILES]
+    return inputs
+
+
+def recipe_key(hasher, generator, recipe_dir, recipe_name, root="."):
+    h = hashlib.sha256(generator.encode())
+    for path in recipe_inputs(recipe_dir, recipe_name, root):
+        h.update(f"\0{path.name}\0{hasher.digest(path)}".encode())
+    return h.hexdigest()
+
+
+# -----------------------------
+# Asset store
+# -----------------------------
+# תמונות ודגלים נשמרים פעם אחת לפי התוכן: assets/<hash><סיומת>.
+# עותקים זהים (גם בשמות שונים) הופכים לקובץ אחד, והשם לא משתנה כל עוד התוכן לא משתנה -
+# אפשר לשמור אותם ב-cache לתמיד
+ASSETS_DIR = "assets"
+ASSETS_MANIFEST = "manifest.json"
+ASSET_RE = re.compile(r"[0-9a-f]{16}\.[a-z0-9]+")
+
+
+def asset_intact(target, source=None):
+    # התוכן של קובץ ב-assets חייב להתאים ל-hash שבשם שלו: מתכונים אחרים עם אותה תמונה מפנים אליו,
+    # והוא מוגש כ-immutable. hardlink למקור (מגרסה קודמת) לא נחשב - עריכה של המקור הייתה משנה אותו
+    try:
+        if source is not None and os.path.samefile(source, target):
+            return False
+        return file_digest(target)[:16] == Path(target).stem
+    except OSError:
+        return False
+
+
+def store_asset(source, root=".", report=None):
+    # עותק ולא hardlink: עריכה של המקור במקום לא תשנה בשקט קובץ שהשם שלו הוא ה-hash
+    source = Path(source)
+    name = f"{file_digest(source)[:16]}{source.suffix.lower()}"
+    target = Path(root) / ASSETS_DIR / name
+    if not asset_intact(target, source):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{name}.{os.getpid()}.tmp")
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+        if report is not None:
+            report.written.append(target)
+    elif report is not None:
+        report.unchanged.append(target)
+    return f"{ASSETS_DIR}/{name}"
+
+
+def store_flags(root=".", report=None):
+    return {flag: store_asset(Path(root) / flag, root, report)
+            for flag in FLAG_FILES if (Path(root) / flag).is_file()}
+
+
+def write_assets_manifest(root, flags, entries, prune=True, report=None):
+    # מפה ציבורית: דגל / מתכון -> הקובץ ב-assets
+    report = report if report is not None else OutputReport()
+    recipes = {rid: entry["image"] for rid, entry in sorted(entries.items()) if entry.get("image")}
+    out_dir = Path(root) / ASSETS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report.write(out_dir / ASSETS_MANIFEST,
+                 json.dumps({"flags": flags, "recipes": recipes}, ensure_ascii=False, indent=2) + "\n")
+
+    if prune:
+        current = {Path(url).name for url in (*flags.values(), *recipes.values())}
+        for old in out_dir.iterdir():
+            if old.name not in current and ASSET_RE.fullmatch(old.name):
+                report.delete(old)
+    return report
+
+
+# -----------------------------
+# Hero image variants
+# -----------------------------
+# התמונה מוצגת ברוחב של עד ~840px ובגובה 260px, אין טעם לשלוח PNG של 2.4MB
+HERO_WIDTHS = [480, 768, 1200, 1800]
+HERO_SIZES = "(max-width: 980px) 100vw, 840px"
+HERO_FALLBACK_WIDTH = 1200
+HERO_DIR = "hero"
+# <stem>-<hash>-<רוחב>.<פורמט> או <stem>-<hash>.json (ה-placeholder)
+HERO_FILE_RE = re.compile(r"(?P<stem>.+-[0-9a-f]{12})(?:-\d+\.[a-z]+|\.json)")
+# רוחב ה-placeholder (נכנס לדף כ-base64, הדפדפן מגדיל ומטשטש אותו)
+HERO_LQIP_WIDTH = 16
+# (סיומת, MIME, פורמט של Pillow, הגדרות שמירה) - JPEG אחרון, הוא ה-fallback של <img>
+HERO_FORMATS = [
+    ("avif", "image/avif", "AVIF", {"quality": 50}),
+    ("webp", "image/webp", "WEBP", {"quality": 75, "method": 6}),
+    ("jpg", "image/jpeg", "JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+]
+
+
+def load_pillow():
+    # Pillow היא תלות אופציונלית - בלעדיה התמונה המקורית נשארת כמו שהיא
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def image_size(image_file):
+    # רוחב וגובה מהכותרת של PNG / JPEG - בלי Pillow
+    try:
+        with open(image_file, "rb") as f:
+            head = f.read(24)
+            if head[:8] == b"\x89PNG\r\n\x1a\n":
+                return struct.unpack(">II", head[16:24])
+            if head[:2] != b"\xff\xd8":
+                return None
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                if marker[1] in (0x01, 0xFF) or 0xD0 <= marker[1] <= 0xD9:
+                    continue
+                length, = struct.unpack(">H", f.read(2))
+                # SOFn (בלי DHT / JPG / DAC) מחזיק את המידות
+                if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack(">xHH", f.read(5))
+                    return width, height
+                f.seek(length - 2, 1)
+    except (OSError, struct.error):
+        return None
+
+
+def make_hero_variants(image_file, root=".", report=None):
+    # מחזיר (וריאנטים, מידע): המידע = מידות + placeholder, נשמר ב-hero/<stem>.json ליד הווריאנטים
+    if image_file is None:
+        return None, None
+    Image = load_pillow()
+    if Image is None:
+        size = image_size(image_file)
+        return None, size and {"width": size[0], "height": size[1]}
+
+    # שם הקובץ כולל hash של המקור, כך שתמונה שלא השתנתה לא מקודדת שוב
+    stem = f"{Path(image_file).stem}-{file_digest(image_file)[:12]}"
+    out_dir = Path(root) / HERO_DIR
+    supported = Image.registered_extensions()
+    info_file = out_dir / f"{stem}.json"
+    try:
+        info = json.loads(info_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        info = None
+
+    try:
+        with Image.open(image_file) as im:
+            src_width, src_height = im.size
+            widths = [w for w in HERO_WIDTHS if w < src_width]
+            if src_width <= HERO_WIDTHS[-1]:
+                widths.append(src_width)
+            else:
+                widths.append(HERO_WIDTHS[-1])
+            rgb = None
+
+            def flat():
+                nonlocal rgb
+                if rgb is None:
+                    rgb = Image.new("RGB", im.size, "white")
+                    src = im.convert("RGBA")
+                    rgb.paste(src, mask=src.getchannel("A"))
+                return rgb
+
+            if info is None:
+                lqip = flat().resize((HERO_LQIP_WIDTH, max(1, round(src_height * HERO_LQIP_WIDTH / src_width))),
+                                     Image.LANCZOS)
+                buf = io.BytesIO()
+                lqip.save(buf, "JPEG", quality=60)
+                info = {"width": src_width, "height": src_height,
+                        "placeholder": "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode("ascii")}
+                out_dir.mkdir(parents=True, exist_ok=True)
+                (report or OutputReport()).write(info_file, json.dumps(info))
+            elif report is not None:
+                report.unchanged.append(info_file)
+            variants = []
+            for ext, mime, fmt, options in HERO_FORMATS:
+                if f".{ext}" not in supported:
+                    continue
+                files = []
+                for width in widths:
+                    target = out_dir / f"{stem}-{width}.{ext}"
+                    if not target.exists():
+                        height = round(src_height * width / src_width)
+                        resized = flat().resize((width, height), Image.LANCZOS)
+                        out_dir.mkdir(parents=True, exist_ok=True)
+                        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+                        resized.save(tmp, fmt, **options)
+                        os.replace(tmp, target)
+                        if report is not None:
+                            report.written.append(target)
+                    elif report is not None:
+                        report.unchanged.append(target)
+                    files.append((target, width))
+                variants.append((mime, files))
+    except OSError as e:
+        print(f"⚠️ לא הצלחתי לעבד את {image_file}: {e}")
+        return None, info
+
+    return (variants if variants and variants[-1][0] == "image/jpeg" else None), info
+
+
+def prune_hero(root, entries, report):
+    # השמות כוללים hash של המקור, אז תמונה שנערכה משאירה סט ישן שאף דף לא מפנה אליו
+    out_dir = Path(root) / HERO_DIR
+    if not out_dir.is_dir():
+        return
+    current = {HERO_FILE_RE.fullmatch(Path(p).name)["stem"]
+               for entry in entries.values() for p in entry.get("hero", ())}
+    for old in out_dir.iterdir():
+        match = HERO_FILE_RE.fullmatch(old.name)
+        if match and match["stem"] not in current:
+            report.delete(old)
+
+
+# -----------------------------
+# Site index
+# -----------------------------
+INDEX_PAGE_SIZE = 60
+
+
+def build_index_css(lang="en"):
+    is_he = lang == "he"
+    font_family = "Alef, system-ui, sans-serif" if is_he else "system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif"
+
+    return f""":root {{
+    --main-orange: #d35400;
+    --section-bg: #fffaf0;
+}}
+
+body {{
+    font-family: {font_family};
+    background: linear-gradient(180deg, #fdf8f0 0%, #fffefc 100%);
+    margin: 0;
+    padding: 40px;
+    display: flex;
+    justify-content: center;
+}}
+.page {{
+    max-width: 1100px;
+    width: 100%;
+    background: #ffffff;
+    border-radius: 16px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.08);
+    padding: 28px 32px 32px;
+    position: relative;
+}}
+.lang-switch {{
+    position: absolute;
+    top: 16px;
+    { 'left' if is_he else 'right' }: 16px;
+    font-size: 14px;
+}}
+.lang-switch img {{
+    width: 20px;
+    height: 14px;
+}}
+h1 {{
+    margin: 6px 0 18px;
+    font-size: 32px;
+    color: var(--main-orange);
+}}
+.cards {{
+    list-style: none;
+    padding: 0;
+    margin: 0;
+    display: grid;
+    grid-template-columns: repeat(auto-fill, minmax(220px, 1fr));
+    gap: 20px;
+}}
+.card a {{
+    display: block;
+    height: 100%;
+    background: var(--section-bg);
+    border: 1px solid #f7d8c5;
+    border-radius: 12px;
+    overflow: hidden;
+    color: inherit;
+    text-decoration: none;
+}}
+.card a:hover {{
+    box-shadow: 0 6px 18px rgba(0,0,0,0.12);
+}}
+.card img, .card .no-image {{
+    display: block;
+    width: 100%;
+    height: 140px;
+    object-fit: cover;
+    background: #f7d8c5;
+}}
+.card-title {{
+    display: block;
+    padding: 10px 12px 4px;
+    font-weight: bold;
+    color: var(--main-orange);
+}}
+.card-meta {{
+    display: block;
+    padding: 0 12px 12px;
+    font-size: 13px;
+    color: #555;
+}}
+.search {{
+    width: 100%;
+    box-sizing: border-box;
+    padding: 10px 14px;
+    margin-bottom: 20px;
+    font: inherit;
+    font-size: 16px;
+    border: 1px solid #f7d8c5;
+    border-radius: 10px;
+    background: var(--section-bg);
+}}
+.search:focus {{
+    outline: 2px solid var(--main-orange);
+}}
+.search-results {{
+    list-style: none;
+    padding: 0;
+    margin: 0;
+}}
+.search-results li {{
+    padding: 8px 0;
+    border-bottom: 1px solid #f0e0d0;
+}}
+.search-results a {{
+    color: var(--main-orange);
+    text-decoration: none;
+    font-weight: bold;
+}}
+.pager {{
+    display: flex;
+    flex-wrap: wrap;
+    gap: 6px;
+    justify-content: center;
+    margin-top: 28px;
+}}
+.pager a, .pager span {{
+    padding: 4px 10px;
+    border-radius: 6px;
+    border: 1px solid #f7d8c5;
+    color: var(--main-orange);
+    text-decoration: none;
+}}
+.pager span {{
+    background: var(--main-orange);
+    color: #fff;
+}}
+.footer {{
+    padding: 12px 0;
+    font-size: 13px;
+    color: #555;
+    text-align: center;
+    border-top: 1px solid #f0e0d0;
+    margin-top: 24px;
+}}
+"""
+
+
+def index_filename(lang, page=1):
+    # index.html / index_p2.html באנגלית, index_he.html / index_he_p2.html בעברית
+    base = "index" if lang == "en" else f"index_{lang}"
+    return f"{base}.html" if page == 1 else f"{base}_p{page}.html"
+
+
+@functools.lru_cache(maxsize=None)
+def compile_index_template(lang="en", stylesheet=None, flag=None, markup_only=False):
+    is_he = lang == "he"
+    flag = flag or ("flag_gb.png" if is_he else "flag_il.png")
+    direction = "rtl" if is_he else "ltr"
+    style_tag = "" if markup_only else build_style_tag(None if stylesheet else page_css("index", lang), stylesheet)
+    heading = "ספר המתכונים" if is_he else "Cookbook"
+    search_text = "חיפוש לפי שם או מצרך…" if is_he else "Search by name or ingredient…"
+    empty_text = "לא נמצאו מתכונים" if is_he else "No recipes found"
+    lang_switch_text = (
+        f'<img src="{flag}" alt="English"> English' if is_he else f'<img src="{flag}" alt="עברית"> עברית'
+    )
+
+    return PageTemplate(f"""<!DOCTYPE html>
+<html lang="{lang}" dir="{direction}">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{heading}{slot("page_title")}</title>
+{style_tag}
+<script src="{SEARCH_DIR}/search.js" defer></script>
+</head>
+
+<body>
+<div class="page">
+
+<div class="lang-switch">
+    <a href="{slot("file_other")}">{lang_switch_text}</a>
+</div>
+
+<h1>{heading}</h1>
+
+<input type="search" class="search" data-base="{SEARCH_DIR}/" data-empty="{empty_text}" placeholder="{search_text}" aria-label="{search_text}">
+<ul class="search-results" hidden></ul>
+
+<ul class="cards">
+{slot("cards")}
+</ul>
+
+<nav class="pager">
+{slot("pager")}
+</nav>
+
+<div class="footer">
+    {"כל הזכויות שמורות לתומר הלל לב ©" if is_he else "© 2026 Tomer Hillel Lev. All rights reserved."}
+</div>
+</div>
+{service_worker_tag()}
+</body>
+</html>
+""")
+
+
+def index_card(entry, lang):
+    page = entry[lang]
+    if entry.get("thumb"):
+        image = f'<img src="{entry["thumb"]}" alt="" loading="lazy" decoding="async">'
+    else:
+        image = '<span class="no-image"></span>'
+    return (f'<li class="card"><a href="{page["url"]}">{image}'
+            f'<span class="card-title">{page["title"]}</span>'
+            f'<span class="card-meta">🕒 {page["time"]} · {page["level"]}</span></a></li>')
+
+
+def build_index_pages(entries, lang="en", stylesheet=None, page_size=INDEX_PAGE_SIZE, flag=None):
+    # מחלק את כל המתכונים (לפי סדר א"ב) לדפים בגודל קבוע - אף דף לא גדל בלי סוף
+    other = "en" if lang == "he" else "he"
+    ordered = sorted(entries.values(), key=lambda e: e[lang]["title"].casefold())
+    pages = [ordered[i:i + page_size] for i in range(0, len(ordered), page_size)] or [[]]
+    template = compile_index_template(lang, stylesheet, flag)
+
+    for number, chunk in enumerate(pages, 1):
+        pager = "\n".join(
+            f"<span>{n}</span>" if n == number else f'<a href="{index_filename(lang, n)}">{n}</a>'
+            for n in range(1, len(pages) + 1)
+        ) if len(pages) > 1 else ""
+        yield index_filename(lang, number), template.render(
+            page_title=f" ({number}/{len(pages)})" if len(pages) > 1 else "",
+            file_other=index_filename(other),
+            cards="\n".join(index_card(entry, lang) for entry in chunk),
+            pager=pager,
+        )
+
+
+def write_index(root, entries, stylesheets=None, report=None, flags=None):
+    root = Path(root)
+    report = report if report is not None else OutputReport()
+    for lang in ("en", "he"):
+        stylesheet = stylesheets[("index", lang)] if stylesheets else None
+        flag = (flags or {}).get("flag_gb.png" if lang == "he" else "flag_il.png")
+        names = set()
+        for filename, html in build_index_pages(entries, lang, stylesheet, flag=flag):
+            report.write(root / filename, html)
+            names.add(filename)
+        # דפים ישנים שכבר לא קיימים (פחות מתכונים מקודם)
+        base = "index" if lang == "en" else f"index_{lang}"
+        for old in root.glob(f"{base}_p*.html"):
+            if old.name not in names and re.fullmatch(rf"{base}_p\d+\.html", old.name):
+                report.delete(old)
+    return report
+
+
+# -----------------------------
+# Whole cookbook (print)
+# -----------------------------
+# מסמך אחד עם כל המתכונים בשפה, מרונדר כזרם של חלקים שנכתבים ישר לקובץ -
+# הזיכרון לא גדל עם מספר המתכונים
+COOKBOOK_CSS = """
+.toc ol {
+    list-style: decimal;
+    padding-inline-start: 28px;
+}
+.toc li {
+    padding: 0;
+    margin-bottom: 4px;
+}
+.toc li::before {
+    content: none;
+}
+.toc a {
+    color: inherit;
+    text-decoration: none;
+}
+.recipe {
+    break-before: page;
+    page-break-before: always;
+}
+"""
+
+
+def cookbook_filename(lang):
+    return f"cookbook_{lang}_print.html"
+
+
+@functools.lru_cache(maxsize=None)
+def compile_cookbook_recipe_template(lang="en"):
+    is_he = lang == "he"
+    label_ingredients = "מצרכים" if is_he else "Ingredients"
+    label_instructions = "הוראות הכנה" if is_he else "Instructions"
+
+    return PageTemplate(f"""
+<section class="recipe" id="{slot("anchor")}">
+<h1>{slot("title")}</h1>
+<p class="description">{slot("description")}</p>
+
+<div class="section-box">
+    <h2>{label_ingredients}</h2>
+    <ul>
+        {slot("ingredients")}
+    </ul>
+</div>
+
+<div class="divider"></div>
+
+<div class="section-box">
+    <h2>{label_instructions}</h2>
+    <ol>
+        {slot("instructions")}
+    </ol>
+</div>
+</section>
+""")
+
+
+def render_cookbook(root, entries, lang="en", stylesheet=None):
+    is_he = lang == "he"
+    direction = "rtl" if is_he else "ltr"
+    heading = "ספר המתכונים" if is_he else "Cookbook"
+    label_contents = "תוכן העניינים" if is_he else "Contents"
+    print_text = "הדפסה" if is_he else "Print"
+    style_tag = build_style_tag(None if stylesheet else page_css("print", lang), stylesheet)
+    cache_dir = Path(root) / PARSE_CACHE_DIR
+    ordered = sorted(entries.items(), key=lambda item: item[1][lang]["title"].casefold())
+
+    yield f"""<!DOCTYPE html>
+<html lang="{lang}" dir="{direction}">
+<head>
+<meta charset="UTF-8">
+<title>{heading} – Print</title>
+{style_tag}
+<style>{COOKBOOK_CSS}</style>
+</head>
+<body>
+
+<h1>{heading}</h1>
+
+<button class="print-button" onclick="window.print()">🖨️ {print_text}</button>
+
+<nav class="toc section-box">
+    <h2>{label_contents}</h2>
+    <ol>
+"""
+    for number, (rid, entry) in enumerate(ordered, 1):
+        yield f'        <li><a href="#recipe-{number}">{entry[lang]["title"]}</a></li>\n'
+    yield """    </ol>
+</nav>
+"""
+
+    template = compile_cookbook_recipe_template(lang)
+    for number, (rid, entry) in enumerate(ordered, 1):
+        # מתכון אחד בכל פעם (מה-cache של הפרסור), ומיד החוצה
+        recipe = load_recipe(Path(root) / f"{rid}_{lang}.txt", lang, cache_dir)
+        fragments = render_fragments(recipe.title, recipe.ingredients, recipe.steps, recipe.description)
+        yield template.render(anchor=f"recipe-{number}", **fragments)
+
+    yield f"""
+<div class="footer">
+    {"כל הזכויות שמורות לתומר הלל לב ©" if is_he else "© 2026 Tomer Hillel Lev. All rights reserved."}
+</div>
+</body>
+</html>
+"""
+
+
+def write_cookbook(root, entries, stylesheets=None, report=None):
+    report = report if report is not None else OutputReport()
+    for lang in ("en", "he"):
+        stylesheet = stylesheets[("print", lang)] if stylesheets else None
+        report.write_chunks(Path(root) / cookbook_filename(lang), render_cookbook(root, entries, lang, stylesheet))
+    return report
+
+
+# -----------------------------
+# Search index
+# -----------------------------
+# אינדקס הפוך (מילה -> מזהי מתכונים) שנטען בדפדפן לפי הצורך, בלי שרת
+SEARCH_DIR = "search"
+SEARCH_TOKEN_RE = re.compile(r"[^\W_]+")
+# אותיות סופיות -> רגילות, כך ש"בצל" ו"בצלים" מתחילים אותו דבר וגם "שום"/"שומשום"
+FINAL_LETTERS = str.maketrans("ךםןףץ", "כמנפצ")
+SHARD_RE = re.compile(r"s-[0-9a-f]{4,6}\.json")
+
+SEARCH_JS = """(() => {
+    const box = document.querySelector(".search");
+    if (!box) return;
+    const base = box.dataset.base;
+    const results = document.querySelector(".search-results");
+    const listing = document.querySelectorAll(".cards, .pager");
+    const col = document.documentElement.lang === "he" ? 1 : 0;
+    const finals = {"ך": "כ", "ם": "מ", "ן": "נ", "ף": "פ", "ץ": "צ"};
+    const shards = new Map();
+    let docs = null;
+    let latest = 0;
+
+    // חייב להתאים ל-normalize_search_text בצד של Python
+    const normalize = s => s.toLowerCase().normalize("NFKD").replace(/\\p{Mn}/gu, "").replace(/[ךםןףץ]/g, c => finals[c]);
+    const tokens = s => (normalize(s).match(/[\\p{L}\\p{N}]+/gu) || []).filter(t => t.length > 1 && !/^\\d+$/.test(t));
+    const load = name => fetch(base + name).then(r => r.ok ? r.json() : {}).catch(() => ({}));
+    const shard = term => {
+        const key = term.codePointAt(0).toString(16).padStart(4, "0");
+        if (!shards.has(key)) shards.set(key, load(`s-${key}.json`));
+        return shards.get(key);
+    };
+
+    async function search(query) {
+        const run = ++latest;
+        const terms = tokens(query);
+        if (!terms.length) {
+            results.hidden = true;
+            listing.forEach(el => el.hidden = false);
+            return;
+        }
+        docs = docs || load("docs.json");
+        let ids = null;
+        for (const term of terms) {
+            const index = await shard(term);
+            const found = new Set();
+            for (const token in index) {
+                if (token.startsWith(term)) index[token].forEach(id => found.add(id));
+            }
+            ids = ids ? new Set([...ids].filter(id => found.has(id))) : found;
+            if (!ids.size) break;
+        }
+        const all = await docs;
+        if (run !== latest) return;
+
+        results.replaceChildren(...[...ids].map(id => all[id]).filter(Boolean)
+            .sort((a, b) => a[col + 2].localeCompare(b[col + 2]))
+            .map(doc => {
+                const li = document.createElement("li");
+                const a = li.appendChild(document.createElement("a"));
+                a.href = doc[col];
+                a.textContent = doc[col + 2];
+                return li;
+            }));
+        if (!results.children.length) {
+            results.appendChild(document.createElement("li")).textContent = box.dataset.empty;
+        }
+        results.hidden = false;
+        listing.forEach(el => el.hidden = true);
+    }
+
+    let timer;
+    box.addEventListener("input", () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => search(box.value), 80);
+    });
+})();
+"""
+
+
+def normalize_search_text(text):
+    # אותיות קטנות, בלי ניקוד/סימנים מצטרפים, ואותיות סופיות כרגילות
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return text.translate(FINAL_LETTERS)
+
+
+def search_tokens(*texts):
+    tokens = set()
+    for text in texts:
+        for token in SEARCH_TOKEN_RE.findall(normalize_search_text(text)):
+            if len(token) > 1 and not token.isdigit():
+                tokens.add(token)
+    return tokens
+
+
+def shard_key(token):
+    return f"{ord(token[0]):04x}"
+
+
+def write_search_index(root, entries, report=None):
+    out_dir = Path(root) / SEARCH_DIR
+    report = report if report is not None else OutputReport()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # docs.json: [url_en, url_he, title_en, title_he] לפי מזהה
+    docs = []
+    shards = {}
+    for doc_id, rid in enumerate(sorted(entries)):
+        entry = entries[rid]
+        docs.append([entry["en"]["url"], entry["he"]["url"], entry["en"]["title"], entry["he"]["title"]])
+        for token in entry.get("tokens", ()):
+            shards.setdefault(shard_key(token), {}).setdefault(token, []).append(doc_id)
+
+    def dump(name, data):
+        report.write(out_dir / name, json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True))
+
+    dump("docs.json", docs)
+    for key, shard in shards.items():
+        dump(f"s-{key}.json", shard)
+    report.write(out_dir / "search.js", SEARCH_JS)
+
+    for old in out_dir.glob("s-*.json"):
+        if SHARD_RE.fullmatch(old.name) and old.stem[2:] not in shards:
+            report.delete(old)
+    return report
+
+
+# -----------------------------
+# Recipe catalog (SQLite + FTS5)
+# -----------------------------
+# כל מתכון מפורסר נשמר ב-SQLite עם אינדקס FTS5, כדי לחפש בלי grep על אלפי קבצי txt.
+# ה-build מעדכן רק מתכונים שהמקורות שלהם השתנו (מפתח לפי hash של הקבצים, כמו ב-manifest)
+CATALOG_PATH = ".build-cache/catalog.sqlite"
+# להעלות כשמשנים את הסכמה או את time_minutes - הקטלוג נבנה מחדש
+CATALOG_VERSION = 3
+CATALOG_SCHEMA = """
+DROP TABLE IF EXISTS recipes;
+DROP TABLE IF EXISTS recipes_fts;
+CREATE TABLE recipes (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    title TEXT NOT NULL,
+    ingredients TEXT NOT NULL,
+    steps TEXT NOT NULL,
+    description TEXT NOT NULL,
+    time TEXT NOT NULL,
+    minutes INTEGER,
+    level TEXT NOT NULL,
+    image TEXT,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    UNIQUE (id, lang)
+);
+CREATE INDEX recipes_minutes ON recipes (lang, minutes);
+-- הטקסט ב-FTS עובר normalize_search_text (בלי ניקוד, אותיות סופיות כרגילות), כמו אינדקס החיפוש באתר
+CREATE VIRTUAL TABLE recipes_fts USING fts5(title, ingredients, steps, description, tokenize = 'unicode61');
+"""
+TIME_UNITS = r"(?:hours?|hrs?|h(?![^\W\d_])|שעות|שעה|minutes?|mins?|m(?![^\W\d_])|דקות|דק)"
+TIME_RE = re.compile(rf"(\d+(?:[.,]\d+)?)(?:\s*[-–]\s*(\d+(?:[.,]\d+)?))?\s*({TIME_UNITS})", re.IGNORECASE)
+# משך שלם ("1h30m", "1 hour 30 minutes", "שעה וחצי") - מה שנתפס עובר ל-time_minutes כמו זמן של מתכון
+QUERY_DURATION = (rf"\d+(?:[.,]\d+)?\s*{TIME_UNITS}(?:\s*(?:and\s+|ו)?\d+(?:[.,]\d+)?\s*{TIME_UNITS})*(?:\s*וחצי)?"
+                  r"|\d+(?:[.,]\d+)?|(?:שעתיים|שעה)(?:\s*(?:וחצי|ו-?\d+\s*(?:דקות|דק)))?")
+# \b לפני המילה: "raisin 20 minutes" הוא לא "in 20 minutes" (ו"בתוך"/"ועד" כן נחשבים)
+QUERY_TIME_RE = re.compile(rf"(?:\b(?:under|within|less than|up to|in|[ובל]?עד|[ובל]?תוך|פחות מ-?)|<=?)\s*"
+                           rf"(?P<duration>{QUERY_DURATION})", re.IGNORECASE)
+QUERY_STOPWORDS = {"recipe", "recipes", "with", "and", "or", "the", "a", "an", "for",
+                   "מתכון", "מתכונים", "עמ", "של", "גמ"}
+
+
+def time_minutes(text):
+    # "45 minutes" / "1 hour 15 minutes" / "30–45 דקות" / "שעה ו-20 דקות" / "שעה וחצי" -> דקות
+    # (בטווח: הגבול העליון)
+    total = None
+    for low, high, unit in TIME_RE.findall(text):
+        value = float((high or low).replace(",", "."))
+        total = (total or 0) + value * (60 if unit.lower().startswith(("h", "שע")) else 1)
+    # "שעה" / "שעתיים" בלי מספר לפניהם
+    rest = TIME_RE.sub(" ", text)
+    if "שעתיים" in rest:
+        total = (total or 0) + 120
+    elif "שעה" in rest:
+        total = (total or 0) + 60
+    if total is not None and "וחצי" in text:
+        total += 30
+    return None if total is None else round(total)
+
+
+def open_catalog(root="."):
+    import sqlite3
+
+    path = Path(root) / CATALOG_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    if db.execute("PRAGMA user_version").fetchone()[0] != CATALOG_VERSION:
+        db.executescript(CATALOG_SCHEMA + f"PRAGMA user_version = {CATALOG_VERSION};")
+    return db
+
+
+def catalog_recipe(db, rid, recipe, url, image, source):
+    # upsert: השורה הישנה (אם יש) יוצאת משתי הטבלאות, והחדשה נכנסת לשתיהן עם אותו rowid
+    old = db.execute("SELECT rowid FROM recipes WHERE id = ? AND lang = ?", (rid, recipe.lang)).fetchone()
+    if old:
+        db.execute("DELETE FROM recipes_fts WHERE rowid = ?", old)
+        db.execute("DELETE FROM recipes WHERE rowid = ?", old)
+    ingredients = "\n".join(recipe.ingredients)
+    steps = "\n".join(recipe.steps).strip()
+    rowid = db.execute(
+        "INSERT INTO recipes (id, lang, title, ingredients, steps, description, time, minutes, level, image, url, "
+        "source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (rid, recipe.lang, recipe.title, ingredients, steps, recipe.description, recipe.time,
+         time_minutes(recipe.time), recipe.level, image, url, source),
+    ).lastrowid
+    db.execute("INSERT INTO recipes_fts (rowid, title, ingredients, steps, description) VALUES (?, ?, ?, ?, ?)",
+               (rowid, *map(normalize_search_text, (recipe.title, ingredients, steps, recipe.description))))
+
+
+def update_catalog(root, recipes, hasher, defaults=None, prune=True):
+    defaults = defaults or DEFAULT_META
+    generator = f"catalog:{parser_version()}:{json.dumps(defaults, sort_keys=True)}"
+    cache_dir = Path(root) / PARSE_CACHE_DIR
+    db = open_catalog(root)
+    updated = 0
+    with db:
+        known = dict(db.execute("SELECT id, source FROM recipes WHERE lang = 'en'"))
+        ids = set()
+        for recipe_dir, recipe_name in recipes:
+            rid = recipe_id(recipe_dir, recipe_name, root)
+            ids.add(rid)
+            source = recipe_key(hasher, generator, recipe_dir, recipe_name, root)
+            if known.get(rid) == source:
+                continue
+            image_file = find_image(recipe_dir, recipe_name)
+            image = Path(os.path.relpath(image_file, root)).as_posix() if image_file else None
+            for lang in ("en", "he"):
+                recipe = load_recipe(Path(recipe_dir) / f"{recipe_name}_{lang}.txt", lang, cache_dir,
+                                     time=defaults[lang]["time"], level=defaults[lang]["level"], image=image)
+                catalog_recipe(db, rid, recipe, f"{rid}_{lang}.html", image, source)
+            updated += 1
+        if prune:
+            for rid in set(known) - ids:
+                rows = db.execute("SELECT rowid FROM recipes WHERE id = ?", (rid,)).fetchall()
+                db.executemany("DELETE FROM recipes_fts WHERE rowid = ?", rows)
+                db.executemany("DELETE FROM recipes WHERE rowid = ?", rows)
+    db.close()
+    return updated
+
+
+def parse_query(text):
+    # "recipes with eggs and panko under 45 minutes" -> (["eggs", "panko"], 45)
+    max_minutes = None
+    match = QUERY_TIME_RE.search(text)
+    if match:
+        max_minutes = time_minutes(match["duration"])
+        if max_minutes is None:
+            # מספר בלי יחידה = דקות
+            max_minutes = round(float(match["duration"].replace(",", ".")))
+        text = text[:match.start()] + " " + text[match.end():]
+    terms = [t for t in SEARCH_TOKEN_RE.findall(normalize_search_text(text))
+             if t not in QUERY_STOPWORDS and not t.isdigit()]
+    return terms, max_minutes
+
+
+def query_catalog(root, text, lang=None, max_minutes=None, level=None, limit=20):
+    terms, query_minutes = parse_query(text)
+    max_minutes = max_minutes if max_minutes is not None else query_minutes
+    # בלי --lang: לפי הכתב של השאילתה
+    lang = lang or ("he" if re.search(r"[֐-׿]", text) else "en")
+
+    where, params = ["r.lang = ?"], [lang]
+    if max_minutes is not None:
+        where.append("r.minutes <= ?")
+        params.append(max_minutes)
+    if level:
+        where.append("r.level LIKE ?")
+        params.append(f"%{level}%")
+    sql = "SELECT r.title, r.time, r.level, r.url FROM recipes r"
+    if terms:
+        # כל מילה היא תחילית ("egg" מוצא גם "eggs"); כותרת ומצרכים שווים יותר מההוראות
+        sql += " JOIN recipes_fts ON recipes_fts.rowid = r.rowid"
+        where.insert(0, "recipes_fts MATCH ?")
+        params.insert(0, " ".join(f'"{t}"*' for t in terms))
+    sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY bm25(recipes_fts, 10.0, 5.0, 1.0, 1.0)" if terms else " ORDER BY r.title"
+    sql += " LIMIT ?"
+    db = open_catalog(root)
+    try:
+        return db.execute(sql, (*params, limit)).fetchall()
+    finally:
+        db.close()
+
+
+# -----------------------------
+# Service worker (offline)
+# -----------------------------
+# sw.js + precache.json בשורש: כל הדפים, ה-CSS, הדגלים ואינדקס החיפוש נשמרים בדפדפן,
+# ואחרי publish יורדים מחדש רק קבצים שה-revision (hash של התוכן) שלהם השתנה.
+# תמונות (assets/, hero/) לא נטענות מראש - הן נשמרות בפעם הראשונה שרואים אותן, ושמן לא משתנה לעולם.
+SW_NAME = "sw.js"
+PRECACHE_NAME = "precache.json"
+INDEX_PAGE_RE = re.compile(r"index(_he)?(_p\d+)?\.html")
+
+SW_JS = """// נוצר על ידי generate_recipe.py - לא לערוך ידנית
+const VERSION = "\0version\0";
+const PAGES = "cookbook-pages";
+const ASSETS = "cookbook-assets";
+const MANIFEST = "precache.json";
+const scope = self.registration.scope;
+
+self.addEventListener("install", event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PAGES);
+        const next = await (await fetch(`${MANIFEST}?v=${VERSION}`, { cache: "no-cache" })).json();
+        const old = await cache.match(MANIFEST);
+        const known = new Map(old ? (await old.json()).entries : []);
+        const cached = new Set((await cache.keys()).map(request => request.url));
+        const changed = next.entries
+            .filter(([url, revision]) => known.get(url) !== revision || !cached.has(new URL(url, scope).href))
+            .map(([url]) => url);
+        await Promise.all(changed.map(async url => {
+            const response = await fetch(url, { cache: "no-cache" });
+            if (response.ok) await cache.put(url, response);
+        }));
+        await cache.put(MANIFEST, new Response(JSON.stringify(next)));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener("activate", event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PAGES);
+        const { entries } = await (await cache.match(MANIFEST)).json();
+        const keep = new Set([MANIFEST, ...entries.map(([url]) => url)].map(url => new URL(url, scope).href));
+        await Promise.all((await cache.keys()).filter(request => !keep.has(request.url))
+            .map(request => cache.delete(request)));
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener("fetch", event => {
+    const request = event.request;
+    if (request.method !== "GET" || !request.url.startsWith(scope)) return;
+    const path = new URL(request.url).href.slice(scope.length).split(/[?#]/)[0];
+    if (/^(assets|hero|css)\\//.test(path)) {
+        // שם עם hash - התוכן לא משתנה, אין צורך לבדוק מול הרשת
+        event.respondWith((async () => {
+            const hit = await caches.match(request);
+            if (hit) return hit;
+            const response = await fetch(request);
+            if (response.ok) (await caches.open(ASSETS)).put(request, response.clone());
+            return response;
+        })());
+        return;
+    }
+    event.respondWith((async () => {
+        const cache = await caches.open(PAGES);
+        return await cache.match(path || "index.html", { ignoreSearch: true }) || fetch(request);
+    })());
+});
+"""
+
+# בתצוגה המקדימה (watch) הדפים משתנים כל הזמן - worker שמבטל את עצמו במקום ה-cache
+SW_DEV_JS = """self.addEventListener("install", () => self.skipWaiting());
+self.addEventListener("activate", event => event.waitUntil(
+    self.registration.unregister().then(() => self.clients.matchAll())
+        .then(clients => clients.forEach(client => client.navigate(client.url)))
+));
+"""
+
+
+def service_worker_tag(root_url=""):
+    return (f'<script>if ("serviceWorker" in navigator) '
+            f'navigator.serviceWorker.register("{root_url}{SW_NAME}");</script>')
+
+
+def precache_paths(root, entries, stylesheets=None, flags=None):
+    root = Path(root)
+    paths = [p for p in root.glob("index*.html") if INDEX_PAGE_RE.fullmatch(p.name)]
+    for rid in entries:
+        recipe = root / rid
+        paths += recipe_outputs(recipe.parent, recipe.name)
+    paths += [root / url for url in (*(stylesheets or {}).values(), *(flags or {}).values())]
+    paths += [p for p in (root / SEARCH_DIR).glob("*") if p.suffix in (".js", ".json")]
+    return sorted(p for p in set(paths) if p.is_file())
+
+
+def write_service_worker(root, entries, stylesheets=None, flags=None, manifest=None, report=None):
+    # revision = hash של הקובץ שנכתב; ה-cache לפי גודל + mtime חוסך קריאה של קבצים שלא השתנו
+    report = report if report is not None else OutputReport()
+    manifest = manifest if manifest is not None else {}
+    hasher = FileHasher(manifest.get("outputs"), root)
+    precache = [[Path(os.path.relpath(p, root)).as_posix(), hasher.digest(p)[:16]]
+                for p in precache_paths(root, entries, stylesheets, flags)]
+    manifest["outputs"] = hasher.seen
+
+    data = json.dumps({"entries": precache}, separators=(",", ":"))
+    report.write(Path(root) / PRECACHE_NAME, data)
+    # sw.js משתנה (ולכן הדפדפן מתקין אותו מחדש) רק כשה-precache השתנה
+    version = hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+    report.write(Path(root) / SW_NAME, PageTemplate(SW_JS).render(version=version))
+    return report
+
+
+# -----------------------------
+# CSS pruning + critical CSS
+# -----------------------------
+# כל גרסת דף (recipe / print / index) מקבלת רק את הכללים שהסלקטורים שלהם יכולים להתאים ל-markup שלה.
+# ה-markup נאסף מהתבנית המקומפלת + דוגמה שמפעילה כל ענף של ה-fragments (טיפים, תמונה וכו')
+CSS_BUILDERS = {"recipe": build_css, "print": build_print_css, "index": build_index_css}
+VOCAB_TAG_RE = re.compile(r"<([a-zA-Z][\w-]*)")
+VOCAB_ATTR_RE = re.compile(r'\b(class|id)="([^"]*)"')
+SELECTOR_IGNORE_RE = re.compile(r"\[[^\]]*\]|::?[\w-]+(?:\([^)]*\))?")
+SELECTOR_TOKEN_RE = re.compile(r"([.#]?)(-?[A-Za-z_][\w-]*)")
+# מה שמעל הקו הזה בדף המתכון נראה בטעינה הראשונה (כותרת, תמונה, מצרכים) - ה-CSS שלו נכנס לדף
+RECIPE_FOLD = '<div class="divider">'
+
+
+def markup_vocabulary(*markup):
+    # תגיות, ".class" ו-"#id" שמופיעים ב-markup
+    vocab = set()
+    for text in markup:
+        vocab.update(tag.lower() for tag in VOCAB_TAG_RE.findall(text))
+        for attr, value in VOCAB_ATTR_RE.findall(text):
+            vocab.update(("." if attr == "class" else "#") + name for name in value.split())
+    return vocab
+
+
+def fragment_probe():
+    # דוגמה שמכסה את כל מה ש-render_fragments ו-build_hero_tag יכולים לייצר
+    fragments = render_fragments("T", ["i"], ["Step", "Tip: t", "טיפ: t", "", "Step"], "d")
+    hero = build_hero_tag("T", "h.png", [("image/webp", [("h.webp", 1)]), ("image/jpeg", [("h.jpg", 1)])],
+                          {"width": 1, "height": 1, "placeholder": "p"})
+    return fragments, hero
+
+
+@functools.lru_cache(maxsize=None)
+def page_vocabulary(variant, lang="en", above_fold=False):
+    fragments, hero = fragment_probe()
+    if variant == "recipe":
+        markup = "".join(compile_html_template(lang, markup_only=True).parts)
+        if above_fold:
+            return markup_vocabulary(markup.split(RECIPE_FOLD)[0], hero, fragments["ingredients"])
+        return markup_vocabulary(markup, hero, *fragments.values())
+    if variant == "print":
+        return markup_vocabulary("".join(compile_print_template(lang, markup_only=True).parts),
+                                 "".join(compile_cookbook_recipe_template(lang).parts), *fragments.values())
+    # באינדקס גם החיפוש מייצר markup - כל מילה ב-search.js נחשבת אפשרית
+    js_words = re.findall(r"[\w-]+", SEARCH_JS)
+    entry = {lang: {"url": "", "title": "", "time": "", "level": ""}}
+    return markup_vocabulary("".join(compile_index_template(lang, markup_only=True).parts),
+                             index_card({**entry, "thumb": "t.jpg"}, lang), index_card(entry, lang),
+                             "<span></span><a></a>") | {*js_words, *(f".{w}" for w in js_words)}
+
+
+def selector_used(selector, vocab):
+    # פסאודו-קלאסים וסלקטורי attribute לא נבדקים - רק תגיות, קלאסים ו-id
+    for prefix, name in SELECTOR_TOKEN_RE.findall(SELECTOR_IGNORE_RE.sub("", selector)):
+        if (prefix + name if prefix else name.lower()) not in vocab:
+            return False
+    return True
+
+
+def css_rules(css):
+    # כללים ברמה העליונה: (prelude כולל רווחים/הערות לפניו, גוף); הערות ומחרוזות לא נספרות כסוגריים
+    rules = []
+    depth = start = brace = 0
+    for m in CSS_TOKEN_RE.finditer(css):
+        if m.group() == "{":
+            if depth == 0:
+                brace = m.start()
+            depth += 1
+        elif m.group() == "}":
+            depth -= 1
+            if depth == 0:
+                rules.append((css[start:brace], css[brace + 1:m.start()]))
+                start = m.end()
+    return rules, css[start:]
+
+
+def prune_css(css, vocab):
+    out = []
+    rules, tail = css_rules(css)
+    for prelude, body in rules:
+        head = re.sub(r"/\*.*?\*/", "", prelude, flags=re.S).strip()
+        if head.startswith("@media"):
+            body = prune_css(body, vocab)
+            if not body.strip():
+                continue
+        elif not head.startswith("@") and not any(selector_used(s, vocab) for s in head.split(",")):
+            continue
+        out.append(f"{prelude}{{{body}}}")
+    return "".join(out) + tail
+
+
+@functools.lru_cache(maxsize=None)
+def page_css(variant, lang="en"):
+    return prune_css(CSS_BUILDERS[variant](lang), page_vocabulary(variant, lang))
+
+
+@functools.lru_cache(maxsize=None)
+def critical_css(lang="en"):
+    return prune_css(page_css("recipe", lang), page_vocabulary("recipe", lang, above_fold=True))
+
+
+# -----------------------------
+# Shared stylesheets
+# -----------------------------
+STYLES_DIR = "css"
+STYLESHEET_RE = re.compile(r"(recipe|print|index)\.(ltr|rtl)\.[0-9a-f]{8}\.css")
+
+
+def write_stylesheets(root=".", prune=True, report=None):
+    # קובץ CSS אחד לכל כיוון/גרסה, עם hash בשם - הדפדפן יכול לשמור אותו ב-cache לתמיד
+    out_dir = Path(root) / STYLES_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stylesheets = {}
+    for variant in CSS_BUILDERS:
+        for lang in ("en", "he"):
+            css = page_css(variant, lang)
+            if report is not None and report.minify:
+                css = minify_css(css)
+            direction = "rtl" if lang == "he" else "ltr"
+            name = f"{variant}.{direction}.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:8]}.css"
+            path = out_dir / name
+            # לא מסתפקים ב-exists(): קובץ שנקטע באמצע כתיבה כבר "קיים" בשם הנכון
+            if write_if_changed(path, css):
+                if report is not None:
+                    report.written.append(path)
+            elif report is not None:
+                report.unchanged.append(path)
+            stylesheets[(variant, lang)] = f"{STYLES_DIR}/{name}"
+
+    if prune:
+        current = {Path(url).name for url in stylesheets.values()}
+        for old in out_dir.glob("*.css"):
+            if old.name not in current and STYLESHEET_RE.fullmatch(old.name):
+                old.unlink()
+                if report is not None:
+                    report.deleted.append(old)
+    return stylesheets
+
+
+# -----------------------------
+# Profiling
+# -----------------------------
+# אירועים בפורמט Chrome trace (chrome://tracing / Perfetto); None = פרופיילינג כבוי
+_profile_events = None
+_profile_pid = None
+
+
+def start_profiling():
+    global _profile_events, _profile_pid
+    _profile_events, _profile_pid = [], os.getpid()
+
+
+def profiling_here():
+    # worker שנוצר ב-fork יורש את הרשימה של התהליך הראשי - היא לא שלו
+    return _profile_events is not None and _profile_pid == os.getpid()
+
+
+def stop_profiling():
+    global _profile_events, _profile_pid
+    events, _profile_events, _profile_pid = _profile_events, None, None
+    return events or []
+
+
+@contextlib.contextmanager
+def stage(name, recipe=None):
+    if _profile_events is None:
+        yield
+        return
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _profile_events.append({
+            "name": name,
+            "cat": "recipe" if recipe else "build",
+            "ph": "X",
+            "ts": started / 1000,
+            "dur": (time.perf_counter_ns() - started) / 1000,
+            "pid": os.getpid(),
+            "tid": os.getpid(),
+            "args": {"recipe": recipe} if recipe else {},
+        })
+
+
+def write_profile(path, events):
+    pids = sorted({e["pid"] for e in events})
+    meta = [{"name": "process_name", "ph": "M", "pid": pid, "tid": pid,
+             "args": {"name": "build" if pid == os.getpid() else f"worker {pid}"}} for pid in pids]
+    write_if_changed(path, json.dumps({"traceEvents": meta + events, "displayTimeUnit": "ms"}))
+
+
+def print_profile_summary(events, top=10):
+    stages = {}
+    recipes = {}
+    for e in events:
+        total, count = stages.get(e["name"], (0, 0))
+        stages[e["name"]] = (total + e["dur"], count + 1)
+        recipe = e["args"].get("recipe")
+        if recipe:
+            recipes[recipe] = recipes.get(recipe, 0) + e["dur"]
+
+    print(f"\n⏱️ {'stage':<16}{'total ms':>12}{'count':>8}{'avg ms':>10}")
+    for name, (total, count) in sorted(stages.items(), key=lambda s: -s[1][0]):
+        print(f"   {name:<16}{total / 1000:>12.1f}{count:>8}{total / 1000 / count:>10.2f}")
+    if recipes:
+        print(f"\n🐢 {'slowest recipes':<40}{'ms':>10}")
+        for recipe, total in sorted(recipes.items(), key=lambda r: -r[1])[:top]:
+            print(f"   {recipe:<40}{total / 1000:>10.1f}")
+
+
+# -----------------------------
+# Build
+# -----------------------------
+def build_recipe(recipe_dir, recipe_name, root=".", stylesheets=None, langs=("en", "he"), minify=False,
+                 profile=False, flags=None, defaults=None):
+    # ב-worker הפרופיילינג מתחיל כאן והאירועים חוזרים לתהליך הראשי; בבנייה סדרתית הם נאספים ישירות
+    own_profile = profile and not profiling_here()
+    if own_profile:
+        start_profiling()
+    recipe_dir = Path(recipe_dir)
+    rid = recipe_id(recipe_dir, recipe_name, root)
+    image_file = find_image(recipe_dir, recipe_name)
+    hero_image = image_file.name if image_file else None
+    report = OutputReport(minify)
+    with stage("image", rid):
+        image_asset = store_asset(image_file, root, report) if image_file else None
+        hero_variants, hero_info = make_hero_variants(image_file, root, report)
+    hero_files = [Path(os.path.relpath(f, root)).as_posix() for _, files in hero_variants or () for f, _ in files]
+    if hero_variants:
+        hero_variants = [
+            (mime, [(Path(os.path.relpath(f, recipe_dir)).as_posix(), w) for f, w in files])
+            for mime, files in hero_variants
+        ]
+
+    # נתיב יחסי מהתיקייה של המתכון לשורש (בשביל הדגלים)
+    root_url = os.path.relpath(root, recipe_dir).replace(os.sep, "/") + "/"
+    if root_url == "./":
+        root_url = ""
+    if image_asset:
+        hero_image = root_url + image_asset
+
+    defaults = defaults or DEFAULT_META
+    file_en = f"{recipe_name}_en.html"
+    file_he = f"{recipe_name}_he.html"
+    pages = [
+        ("en", defaults["en"]["time"], defaults["en"]["level"], file_en, file_he),
+        ("he", defaults["he"]["time"], defaults["he"]["level"], file_he, file_en),
+    ]
+
+    # רשומה לדף האינדקס: כתובות יחסיות לשורש
+    rel_dir = Path(os.path.relpath(recipe_dir, root)).as_posix()
+    rel_dir = "" if rel_dir == "." else rel_dir + "/"
+    # בלי וריאנט מוקטן (אין Pillow) אין תמונה בכרטיס - המקור המלא הוא 2MB+ לכל כרטיס
+    thumb = None
+    if hero_variants:
+        thumb = rel_dir + min(hero_variants[-1][1], key=lambda f: f[1])[0]
+    entry = {"thumb": thumb, "image": image_asset, "hero": hero_files}
+    tokens = set()
+
+    cache_dir = Path(root) / PARSE_CACHE_DIR
+    for lang, time_text, level_text, file_self, file_other in pages:
+        if lang not in langs:
+            continue
+        with stage("parse", rid):
+            recipe = load_recipe(recipe_dir / f"{recipe_name}_{lang}.txt", lang, cache_dir,
+                                 time=time_text, level=level_text, image=hero_image)
+        t, ing, inst, desc = recipe.title, recipe.ingredients, recipe.steps, recipe.description
+        entry[lang] = {"title": t, "url": rel_dir + file_self, "time": recipe.time, "level": recipe.level}
+        tokens |= search_tokens(t, *ing)
+        page = {
+            "lang": lang,
+            "stylesheets": {variant: root_url + url for (variant, page_lang), url in (stylesheets or {}).items()
+                            if page_lang == lang},
+            "time_text": recipe.time,
+            "level_text": recipe.level,
+            "hero_tag": build_hero_tag(t, recipe.image, hero_variants, hero_info),
+            "file_other": file_other,
+            "recipe_name": recipe_name,
+            "root_url": root_url,
+            "flag": (flags or {}).get("flag_gb.png" if lang == "he" else "flag_il.png"),
+        }
+        with stage("render fragments", rid):
+            fragments = render_fragments(t, ing, inst, desc)
+        for name, suffix, render in OUTPUT_VARIANTS:
+            with stage(f"render {name}", rid):
+                html = render(fragments, page)
+            with stage("write", rid):
+                report.write(recipe_dir / f"{recipe_name}_{lang}{suffix}.html", html)
+
+    entry["tokens"] = sorted(tokens)
+    events = stop_profiling() if own_profile else []
+    return recipe_dir / recipe_name, image_file, report, entry, events
+
+
+def _build_recipe_task(args):
+    return build_recipe(*args)
+
+
+def build_all(root=".", names=None, jobs=None, force=False, report=None, minify=False, compress=False,
+              cookbook=False, profile=None, defaults=None):
+    # profile = נתיב לקובץ Chrome trace (None = בלי פרופיילינג)
+    defaults = defaults or DEFAULT_META
+    if profile:
+        start_profiling()
+    with stage("discover"):
+        recipes = find_recipes(root)
+        if names:
+            recipes = [(d, n) for d, n in recipes if n in names]
+
+    # בנייה חלקית (לפי שמות) לא מוחקת CSS ישן - מתכונים אחרים עדיין מפנים אליו
+    report = report if report is not None else OutputReport()
+    report.minify = minify
+    styles_before = len(report.written) + len(report.deleted)
+    stylesheets = write_stylesheets(root, prune=not names, report=report)
+    styles_changed = len(report.written) + len(report.deleted) != styles_before
+    flags = store_flags(root, report)
+    with stage("hash"):
+        manifest = load_manifest(root)
+        hasher = FileHasher(manifest["files"], root)
+        # אפשרויות שמשנות את הפלט הן חלק מהמפתח של כל מתכון
+        generator = (f"{generator_digest()}:minify={minify}:compress={compress}"
+                     f":defaults={json.dumps(defaults, sort_keys=True)}")
+        keys = {}
+        tasks = []
+        for recipe_dir, recipe_name in recipes:
+            rid = recipe_id(recipe_dir, recipe_name, root)
+            keys[rid] = recipe_key(hasher, generator, recipe_dir, recipe_name, root)
+            previous = manifest.get("index", {}).get(rid, {})
+            image = previous.get("image")
+            up_to_date = (
+                manifest["recipes"].get(rid) == keys[rid]
+                and all(p.exists() for p in recipe_outputs(recipe_dir, recipe_name))
+                # לפי hash (עם ה-cache של גודל + mtime), לא רק exists(): קובץ שנדרס ב-assets מתוקן בבנייה הזו
+                and (image is None or (hasher.digest(Path(root) / image) or "")[:16] == Path(image).stem)
+                and all((Path(root) / p).exists() for p in previous.get("hero", ()))
+            )
+            if force or not up_to_date:
+                tasks.append((recipe_dir, recipe_name, root, stylesheets, ("en", "he"), minify, bool(profile),
+                              flags, defaults))
+    skipped = len(recipes) - len(tasks)
+    if tasks and load_pillow() is None:
+        print("⚠️ Pillow לא מותקן - התמונות יוצגו בגודל המקורי ובלי תמונות באינדקס (pip install Pillow).")
+
+    results = []
+    if jobs == 1 or len(tasks) <= 1:
+        results = [report_recipe(*r) for r in map(_build_recipe_task, tasks)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = jobs or os.cpu_count() or 1
+        # חלוקה לחבילות כדי לא לשלם על תקשורת בין תהליכים לכל מתכון בנפרד
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [report_recipe(*r) for r in pool.map(_build_recipe_task, tasks, chunksize=chunksize)]
+
+    index = manifest.setdefault("index", {})
+    rebuilt = []
+    for (recipe_dir, recipe_name, *_), (_, _, recipe_report, entry, events) in zip(tasks, results):
+        rid = recipe_id(recipe_dir, recipe_name, root)
+        report.merge(recipe_report)
+        # כל מה שמתכון שנבנה מחדש מייצר נכנס ל-publish, גם אם הבייטים לא השתנו -
+        # ייתכן שהם נכתבו קודם ע"י watch ועדיין לא נוספו ל-git
+        rebuilt += [*recipe_report.written, *recipe_report.unchanged, *recipe_inputs(recipe_dir, recipe_name, root)]
+        manifest["recipes"][rid] = keys[rid]
+        index[rid] = entry
+        if profiling_here():
+            _profile_events.extend(events)
+    index_changed = bool(tasks)
+    if names:
+        manifest["files"].update(hasher.seen)
+    else:
+        # מתכונים וקבצים שנמחקו יוצאים מה-manifest
+        manifest["recipes"] = {rid: key for rid, key in manifest["recipes"].items() if rid in keys}
+        manifest["files"] = hasher.seen
+        index_changed |= any(rid not in keys for rid in index)
+        manifest["index"] = index = {rid: entry for rid, entry in index.items() if rid in keys}
+    if index_changed or not (Path(root) / index_filename("en")).exists() \
+            or not (Path(root) / SEARCH_DIR / "docs.json").exists():
+        with stage("index"):
+            write_index(root, index, stylesheets, report, flags)
+            write_search_index(root, index, report)
+    write_assets_manifest(root, flags, index, prune=not names, report=report)
+    if not names:
+        prune_hero(root, index, report)
+    with stage("catalog"):
+        cataloged = update_catalog(root, recipes, hasher, defaults, prune=not names)
+    if cataloged:
+        print(f"🗂️ {cataloged} recipes cataloged")
+    if report.written or report.deleted or not (Path(root) / SW_NAME).exists():
+        with stage("service worker"):
+            write_service_worker(root, index, stylesheets, flags, manifest, report)
+    # cookbook שכבר נוצר מתעדכן בכל build, גם בלי --cookbook - אחרת הוא נשאר עם מתכונים ישנים
+    # ומפנה ל-CSS שה-build הזה מחק
+    cookbook_exists = all((Path(root) / cookbook_filename(lang)).exists() for lang in ("en", "he"))
+    if (cookbook or cookbook_exists) and (index_changed or styles_changed or not cookbook_exists):
+        with stage("cookbook"):
+            write_cookbook(root, index, stylesheets, report)
+
+    if compress:
+        with stage("compress"):
+            compressed = compress_outputs(root, report, manifest, jobs)
+        if compressed and load_brotli() is None:
+            print("⚠️ brotli לא מותקן - נוצרים רק קבצי .gz (pip install brotli).")
+        if compressed:
+            print(f"🗜️ {compressed} files precompressed")
+    else:
+        drop_compressed(root, [*report.written, *report.deleted], report, manifest)
+
+    # קבצים שהשתנו מאז ה-publish האחרון: פלטים + המקורות של מה שנבנה (publish מוסיף רק אותם ל-git)
+    with stage("manifest"):
+        add_pending(manifest, root, [*report.written, *report.deleted, *rebuilt])
+        save_manifest(manifest, root)
+
+    if profile:
+        events = stop_profiling()
+        write_profile(profile, events)
+        print_profile_summary(events)
+        print(f"📈 Chrome trace: {profile}")
+    return results, skipped
+
+
+def report_recipe(recipe, image_file, recipe_report, entry, events):
+    if image_file is None:
+        print(f"⚠️ לא נמצאה תמונה עבור {recipe}. המתכון ייווצר בלי תמונה.")
+    else:
+        print(f"✅ {recipe}: התמונה שנבחרה: {image_file}")
+    return recipe, image_file, recipe_report, entry, events
+
+
+# -----------------------------
+# Watch mode + preview server
+# -----------------------------
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();</script>'
+
+
+def scan_sources(root="."):
+    # mtime של כל קבצי המקור (txt + תמונות); תיקיות פלט לא נסרקות
+    sources = {}
+    skip = SKIP_DIRS | {HERO_DIR, STYLES_DIR, ASSETS_DIR}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in skip and not d.startswith(".")]
+        for filename in filenames:
+            suffix = os.path.splitext(filename)[1].lower()
+            if suffix == ".txt" or suffix in IMAGE_SUFFIXES:
+                path = os.path.join(dirpath, filename)
+                try:
+                    sources[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+    return sources
+
+
+def affected_recipes(changed):
+    # קובץ ששונה -> {(תיקייה, מתכון): שפות לבנייה מחדש}
+    targets = {}
+    for path in changed:
+        path = Path(path)
+        name = path.name
+        for lang in ("en", "he"):
+            if name.endswith(f"_{lang}.txt"):
+                recipe_name = name[:-len(f"_{lang}.txt")]
+                other = "he" if lang == "en" else "en"
+                if path.exists() and (path.parent / f"{recipe_name}_{other}.txt").exists():
+                    targets.setdefault((path.parent, recipe_name), set()).add(lang)
+        if path.suffix.lower() in IMAGE_SUFFIXES:
+            recipe_name = path.stem
+            if (path.parent / f"{recipe_name}_en.txt").exists() and (path.parent / f"{recipe_name}_he.txt").exists():
+                targets.setdefault((path.parent, recipe_name), set()).update(("en", "he"))
+    return targets
+
+
+class LiveReload:
+    # מונה גרסה שהדפדפנים מחכים לו דרך Server-Sent Events
+    def __init__(self):
+        self.version = 0
+        self.changed = threading.Condition()
+
+    def notify(self):
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+    def wait(self, version, timeout=15):
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version, timeout=timeout)
+            return self.version
+
+
+def make_preview_handler(root, live_reload):
+    from http.server import SimpleHTTPRequestHandler
+
+    class PreviewHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(root), **kwargs)
+
+        def log_message(self, format, *args):
+            pass
+
+        def end_headers(self):
+            # קבצים עם hash בשם לא משתנים לעולם
+            if self.path.startswith((f"/{ASSETS_DIR}/", f"/{HERO_DIR}/", f"/{STYLES_DIR}/")):
+                self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            super().end_headers()
+
+        def do_GET(self):
+            if self.path == LIVE_RELOAD_PATH:
+                return self.send_events()
+            if self.path.split("?")[0] == f"/{SW_NAME}":
+                return self.send_data(SW_DEV_JS.encode("utf-8"), "text/javascript")
+            path = Path(self.translate_path(self.path))
+            if path.is_dir():
+                path = path / "index.html"
+            if path.suffix == ".html" and path.is_file():
+                return self.send_page(path)
+            return super().do_GET()
+
+        def send_page(self, path):
+            # מזריקים את סקריפט ה-live reload רק בתשובה, לא בקובץ שעל הדיסק
+            body = path.read_text(encoding="utf-8").replace("</body>", LIVE_RELOAD_SCRIPT + "\n</body>", 1)
+            self.send_data(body.encode("utf-8"), "text/html; charset=utf-8")
+
+        def send_data(self, data, content_type):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_events(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            version = live_reload.version
+            try:
+                while True:
+                    new_version = live_reload.wait(version)
+                    if new_version != version:
+                        self.wfile.write(b"data: reload\n\n")
+                        version = new_version
+                    else:
+                        self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return PreviewHandler
+
+
+def watch(root=".", host="127.0.0.1", port=8000, interval=0.25, jobs=None, minify=False, defaults=None):
+    root = Path(root)
+    results, skipped = build_all(root, jobs=jobs, minify=minify, defaults=defaults)
+    print(f"✅ {len(results)} recipes built, {skipped} unchanged")
+
+    stylesheets = write_stylesheets(root, prune=False, report=OutputReport(minify))
+    flags = store_flags(root)
+    live_reload = LiveReload()
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), make_preview_handler(root, live_reload))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"👀 Watching {root.resolve()} - preview at http://{host}:{server.server_port}/ (Ctrl+C to stop)")
+
+    sources = scan_sources(root)
+    try:
+        while True:
+            time.sleep(interval)
+            current = scan_sources(root)
+            changed = [p for p, mtime in current.items() if sources.get(p) != mtime]
+            sources = current
+            targets = affected_recipes(changed)
+            if not targets:
+                continue
+            for (recipe_dir, recipe_name), langs in sorted(targets.items()):
+                started = time.perf_counter()
+                try:
+                    _, _, recipe_report, _, _ = build_recipe(recipe_dir, recipe_name, root, stylesheets,
+                                                             langs=sorted(langs), minify=minify, flags=flags,
+                                                             defaults=defaults)
+                except Exception as e:  # טעות בקובץ לא אמורה להפיל את ה-watch
+                    print(f"❌ {recipe_dir / recipe_name}: {e}")
+                    continue
+                # גם מה שה-watch כותב צריך להגיע ל-publish הבא
+                manifest = load_manifest(root)
+                drop_compressed(root, recipe_report.written, recipe_report, manifest)
+                add_pending(manifest, root, [*recipe_report.written, *recipe_report.unchanged, *recipe_report.deleted,
+                                             *recipe_inputs(recipe_dir, recipe_name, root)])
+                save_manifest(manifest, root)
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"🔄 {recipe_dir / recipe_name} ({', '.join(sorted(langs))}) {elapsed:.0f}ms")
+            live_reload.notify()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+    finally:
+        server.shutdown()
+
+
+# -----------------------------
+# On-demand render server
+# -----------------------------
+# דפים נבנים מה-txt רק כשמבקשים אותם ונשמרים ב-LRU מוגבל בגודל -
+# בקורפוס גדול (או כזה שנערך כל הזמן) לא בונים מראש דפים שאף אחד לא פותח
+PAGE_RE = re.compile(r"(?P<name>.+)_(?P<lang>en|he)(?P<suffix>_print)?\.html")
+
+
+class PageCache:
+    # רשומה = (חותמת של קבצי המקור, ETag, גוף הדף); dict שומר סדר, אז הראשון הוא הכי פחות בשימוש
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.pages = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, stamp):
+        with self.lock:
+            entry = self.pages.pop(key, None)
+            if entry is None:
+                return None
+            if entry[0] != stamp:
+                # קובץ המקור השתנה מאז הרינדור
+                self.size -= len(entry[2])
+                return None
+            self.pages[key] = entry
+            return entry
+
+    def put(self, key, stamp, body):
+        entry = (stamp, f'"{hashlib.sha256(body).hexdigest()[:16]}"', body)
+        with self.lock:
+            old = self.pages.pop(key, None)
+            if old is not None:
+                self.size -= len(old[2])
+            self.pages[key] = entry
+            self.size += len(body)
+            while self.size > self.max_bytes and len(self.pages) > 1:
+                self.size -= len(self.pages.pop(next(iter(self.pages)))[2])
+        return entry
+
+
+def source_stamp(*paths):
+    stamp = []
+    for path in paths:
+        if path is not None:
+            st = os.stat(path)
+            stamp.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+def render_page(root, recipe_dir, recipe_name, lang="en", suffix="", defaults=None):
+    # כמו build_recipe לדף אחד, בלי לכתוב כלום: CSS בתוך הדף, התמונה והדגלים המקוריים
+    defaults = (defaults or DEFAULT_META)[lang]
+    image_file = find_image(recipe_dir, recipe_name)
+    size = image_size(image_file) if image_file else None
+    recipe = load_recipe(Path(recipe_dir) / f"{recipe_name}_{lang}.txt", lang, time=defaults["time"],
+                         level=defaults["level"], image=image_file.name if image_file else None)
+    root_url = os.path.relpath(root, recipe_dir).replace(os.sep, "/") + "/"
+    page = {
+        "lang": lang,
+        "stylesheets": {},
+        "time_text": recipe.time,
+        "level_text": recipe.level,
+        "hero_tag": build_hero_tag(recipe.title, recipe.image, None,
+                                   size and {"width": size[0], "height": size[1]}),
+        "file_other": f"{recipe_name}_{'he' if lang == 'en' else 'en'}.html",
+        "recipe_name": recipe_name,
+        "root_url": "" if root_url == "./" else root_url,
+    }
+    fragments = render_fragments(recipe.title, recipe.ingredients, recipe.steps, recipe.description)
+    render = next(render for _, variant_suffix, render in OUTPUT_VARIANTS if variant_suffix == suffix)
+    return render(fragments, page).encode("utf-8")
+
+
+def make_render_handler(root, cache, defaults=None):
+    from http.server import SimpleHTTPRequestHandler
+
+    class RenderHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(root), **kwargs)
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self.serve(head=False)
+
+        def do_HEAD(self):
+            self.serve(head=True)
+
+        def serve(self, head):
+            if self.path.split("?")[0] == f"/{SW_NAME}":
+                return self.send_dev_worker(head)
+            path = Path(self.translate_path(self.path))
+            match = PAGE_RE.fullmatch(path.name)
+            sources = match and [path.parent / f"{match['name']}_{lang}.txt" for lang in ("en", "he")]
+            # כל מה שהוא לא דף של מתכון (תמונות, דגלים, אינדקס) מוגש כקובץ רגיל
+            if not match or not all(p.is_file() for p in sources):
+                return super().do_HEAD() if head else super().do_GET()
+
+            recipe_dir, name, lang = path.parent, match["name"], match["lang"]
+            try:
+                stamp = source_stamp(path.parent / f"{name}_{lang}.txt", find_image(recipe_dir, name))
+                entry = cache.get(str(path), stamp) or cache.put(
+                    str(path), stamp, render_page(root, recipe_dir, name, lang, match["suffix"] or "", defaults))
+            except Exception as e:  # קובץ שבור לא מפיל את השרת
+                return self.send_error(500, f"{name}_{lang}: {e}")
+            _, etag, body = entry
+
+            tags = {t.strip().removeprefix("W/") for t in self.headers.get("If-None-Match", "").split(",")}
+            not_modified = etag in tags or "*" in tags
+            self.send_response(304 if not_modified else 200)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            if not not_modified:
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not (head or not_modified):
+                self.wfile.write(body)
+
+        def send_dev_worker(self, head):
+            # כמו ב-watch: sw.js שנשאר מ-build קודם היה מגיש דפים מה-precache במקום לרנדר אותם,
+            # אז במקומו worker שמבטל את עצמו
+            data = SW_DEV_JS.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/javascript")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            if not head:
+                self.wfile.write(data)
+
+    return RenderHandler
+
+
+def serve(root=".", host="127.0.0.1", port=8000, cache_mb=64, defaults=None):
+    from http.server import ThreadingHTTPServer
+
+    root = Path(root)
+    cache = PageCache(cache_mb * 1024 * 1024)
+    server = ThreadingHTTPServer((host, port), make_render_handler(root, cache, defaults))
+    server.daemon_threads = True
+    print(f"🍳 Rendering {root.resolve()} on demand at http://{host}:{server.server_port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped ({len(cache.pages)} pages cached, {cache.size / 1e6:.1f} MB).")
+    finally:
+        server.server_close()
+
+
+# -----------------------------
+# Publish
+# -----------------------------
+def git(root, *args, paths=None, check=True):
+    # הנתיבים עוברים ב-stdin (לא בשורת הפקודה) כדי שאלפי קבצים לא יחרגו מהגבלת האורך
+    if paths is not None:
+        args += ("--pathspec-from-file=-", "--pathspec-file-nul")
+    import subprocess
+
+    return subprocess.run(
+        ["git", "--literal-pathspecs", "-C", str(root), *args],
+        input="\0".join(paths) if paths is not None else None,
+        capture_output=True, text=True, check=check,
+    )
+
+
+def publish(root=".", message="Update recipes HTML + images", remote="origin", branch=None,
+            push=True, jobs=None, minify=False, compress=False, defaults=None):
+    # במקום "git add ." על כל העץ: רק הקבצים שה-build כתב/מחק מאז ה-publish הקודם
+    report = OutputReport()
+    build_all(root, jobs=jobs, report=report, minify=minify, compress=compress, defaults=defaults)
+    print(f"📝 {report.summary()}")
+
+    manifest = load_manifest(root)
+    pending = manifest.get("pending", [])
+    existing = [p for p in pending if (Path(root) / p).exists()]
+    removed = [p for p in pending if not (Path(root) / p).exists()]
+    if existing:
+        git(root, "add", paths=existing)
+    if removed:
+        git(root, "rm", "--cached", "--quiet", "--ignore-unmatch", paths=removed)
+
+    if git(root, "diff", "--cached", "--quiet", check=False).returncode == 0:
+        print("✅ Nothing changed - no commit.")
+        committed = False
+    else:
+        git(root, "commit", "--quiet", "-m", message)
+        print(f"✏️ Committed {len(pending)} paths: {message}")
+        committed = True
+
+    manifest["pending"] = []
+    save_manifest(manifest, root)
+
+    # דוחפים גם בלי commit חדש: commit מ-publish קודם שה-push שלו נכשל עדיין לא הגיע ל-remote
+    if push:
+        target = f"HEAD:{branch}" if branch else "HEAD"
+        result = git(root, "push", "--porcelain", remote, target)
+        # בפורמט porcelain, "=" מסמן ref שכבר מעודכן ב-remote
+        if all(line.startswith("=") for line in result.stdout.splitlines() if "\t" in line):
+            print(f"✅ {remote} is up to date.")
+        else:
+            print(f"📤 Pushed to {remote}.")
+    return committed
+
+
+# -----------------------------
+# Main
+# -----------------------------
+# כל מה שכבד (Pillow, brotli, process pool, שרת HTTP, git) נטען רק בפקודה שצריכה אותו -
+# import של המודול עצמו לא כותב כלום ועולה מהר
+COMMANDS = ("build", "watch", "serve", "query", "publish", "bench")
+
+
+def cli_defaults(args):
+    return {
+        "en": {"time": args.time_en, "level": args.level_en},
+        "he": {"time": args.time_he, "level": args.level_he},
+    }
+
+
+def cmd_build(args):
+    report = OutputReport()
+    results, skipped = build_all(args.root, names=args.names, jobs=args.jobs, force=args.force, report=report,
+                                 minify=args.minify, compress=args.compress, cookbook=args.cookbook,
+                                 profile=args.profile, defaults=cli_defaults(args))
+    if not results and not skipped:
+        print("⚠️ לא נמצאו מתכונים.")
+        return 1
+    if skipped:
+        print(f"⏭️ {skipped} recipes unchanged")
+    print(f"✅ HTML + Print HTML created for EN + HE ({len(results)} recipes)")
+    print(f"📝 {report.summary()}")
+    return 0
+
+
+def cmd_watch(args):
+    watch(args.root, host=args.host, port=args.port, interval=args.interval, jobs=args.jobs, minify=args.minify,
+          defaults=cli_defaults(args))
+    return 0
+
+
+def cmd_serve(args):
+    serve(args.root, host=args.host, port=args.port, cache_mb=args.cache_mb, defaults=cli_defaults(args))
+    return 0
+
+
+def cmd_query(args):
+    if not (Path(args.root) / CATALOG_PATH).exists():
+        print("⚠️ אין עדיין קטלוג - הריצו build קודם.")
+        return 1
+    started = time.perf_counter()
+    rows = query_catalog(args.root, " ".join(args.query), lang=args.lang, max_minutes=args.max_minutes,
+                         level=args.level, limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"🔎 {len(rows)} recipes ({elapsed:.1f} ms)")
+    for title, time_text, level, url in rows:
+        print(f"   {title} · 🕒 {time_text} · {level} — {url}")
+    return 0 if rows else 1
+
+
+def cmd_publish(args):
+    import subprocess
+
+    try:
+        publish(args.root, message=args.message, remote=args.remote, branch=args.branch,
+                push=not args.no_push, jobs=args.jobs, minify=args.minify, compress=args.compress,
+                defaults=cli_defaults(args))
+    except subprocess.CalledProcessError as e:
+        print(f"❌ git {' '.join(e.cmd[4:])} failed:\n{e.stderr or e.stdout}")
+        return 1
+    return 0
+
+
+def cmd_bench(argv):
+    import bench_recipes
+
+    return bench_recipes.main(argv)
+
+
+def main(argv=None):
+    import argparse
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # בלי פקודה = build, כמו קודם
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "build")
+    if argv[0] == "bench":
+        # הארגומנטים עוברים כמו שהם ל-bench_recipes.py (ראה bench --help)
+        return cmd_bench(argv[1:])
+
+    base = argparse.ArgumentParser(add_help=False)
+    base.add_argument("--root", default=".", help="cookbook root directory")
+    for lang in ("en", "he"):
+        for field in ("time", "level"):
+            base.add_argument(f"--{field}-{lang}", default=DEFAULT_META[lang][field], metavar="TEXT",
+                              help=f"{lang.upper()} {field} for recipes that don't set it "
+                                   f"(default: {DEFAULT_META[lang][field]})")
+
+    common = argparse.ArgumentParser(add_help=False, parents=[base])
+    common.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes (default: CPU count, 1 = serial)")
+    common.add_argument("--minify", action="store_true", help="minify the generated HTML and CSS")
+    common.add_argument("--compress", action="store_true",
+                        help="write precompressed .gz (and .br, with brotli installed) next to each output")
+
+    parser = argparse.ArgumentParser(description="Build recipe HTML pages (EN + HE, screen + print).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", parents=[common], help="build recipe pages (default)")
+    build.add_argument("names", nargs="*", help="recipe names to build (default: every recipe in the tree)")
+    build.add_argument("--force", action="store_true", help="rebuild every recipe, ignoring the build manifest")
+    build.add_argument("--cookbook", action="store_true",
+                       help="also write cookbook_<lang>_print.html with every recipe in one printable document")
+    build.add_argument("--profile", nargs="?", const="build-profile.json", default=None, metavar="TRACE",
+                       help="time every stage per recipe; writes a Chrome trace (default: build-profile.json)")
+    build.set_defaults(func=cmd_build)
+
+    watch_cmd = commands.add_parser("watch", parents=[common], help="rebuild on change and serve a live preview")
+    watch_cmd.add_argument("--host", default="127.0.0.1")
+    watch_cmd.add_argument("--port", type=int, default=8000)
+    watch_cmd.add_argument("--interval", type=float, default=0.25, help="polling interval in seconds")
+    watch_cmd.set_defaults(func=cmd_watch)
+
+    serve_cmd = commands.add_parser("serve", parents=[base],
+                                    help="render recipe pages on request (LRU cache, ETag/304), no build needed")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=8000)
+    serve_cmd.add_argument("--cache-mb", type=int, default=64, help="rendered page cache size in MB (default: 64)")
+    serve_cmd.set_defaults(func=cmd_serve)
+
+    query_cmd = commands.add_parser("query", help="search the recipe catalog built by 'build' (SQLite FTS5)")
+    query_cmd.add_argument("query", nargs="*", help='e.g. "eggs and panko under 45 minutes"')
+    query_cmd.add_argument("--root", default=".", help="cookbook root directory")
+    query_cmd.add_argument("--lang", choices=("en", "he"), default=None,
+                           help="language to search (default: from the query's script)")
+    query_cmd.add_argument("--max-minutes", type=int, default=None)
+    query_cmd.add_argument("--level", default=None, help="skill level contains this text")
+    query_cmd.add_argument("-n", "--limit", type=int, default=20)
+    query_cmd.set_defaults(func=cmd_query)
+
+    publish_cmd = commands.add_parser("publish", parents=[common],
+                                      help="build, then commit and push only the files the build changed")
+    publish_cmd.add_argument("-m", "--message", default="Update recipes HTML + images")
+    publish_cmd.add_argument("--remote", default="origin")
+    publish_cmd.add_argument("--branch", default=None, help="remote branch (default: the current branch)")
+    publish_cmd.add_argument("--no-push", action="store_true", help="commit locally without pushing")
+    publish_cmd.set_defaults(func=cmd_publish)
+    commands.add_parser("bench", help="benchmark the generator on a synthetic corpus (see bench --help)")
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
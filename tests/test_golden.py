@@ -0,0 +1,179 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import bench_recipes  # noqa: E402
+import generate_recipe as gr  # noqa: E402
+
+# -----------------------------
+# Golden corpus
+# -----------------------------
+# cases/<name>_<lang>.txt - קבצי מקור קפואים (Shnitzel, Shakshuka + מקרי קצה + סינתטיים).
+# expected/ - הפלט המדויק (byte-exact) של הפרסור ושל דפי ה-HTML/Print לכל קובץ.
+# אחרי שינוי מכוון בפלט:  python tests/test_golden.py --update  (או GOLDEN_UPDATE=1)
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+CASES_DIR = GOLDEN_DIR / "cases"
+EXPECTED_DIR = GOLDEN_DIR / "expected"
+THROUGHPUT_FILE = GOLDEN_DIR / "throughput.json"
+
+# קצב מתחת ל-baseline * tolerance נכשל; מכונה אחרת/CI רועש - GOLDEN_THROUGHPUT_TOLERANCE או GOLDEN_SKIP_THROUGHPUT=1
+DEFAULT_TOLERANCE = 0.7
+THROUGHPUT_RECIPES = 100
+THROUGHPUT_REPEATS = 5
+
+UPDATE = os.environ.get("GOLDEN_UPDATE") == "1"
+
+
+def golden_cases():
+    return sorted(CASES_DIR.glob("*.txt"))
+
+
+def case_lang(path):
+    return path.stem.rsplit("_", 1)[1]
+
+
+def read_exact(path):
+    # newline="" - בלי המרת סופי שורות, ההשוואה היא על התוכן המדויק
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def write_exact(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def render_case(path):
+    lang = case_lang(path)
+    name = path.stem.rsplit("_", 1)[0]
+    other = "he" if lang == "en" else "en"
+    defaults = gr.DEFAULT_META[lang]
+    recipe = gr.load_recipe(path, lang, time=defaults["time"], level=defaults["level"], image="hero.png")
+    parsed = {
+        "title": recipe.title, "ingredients": recipe.ingredients, "steps": recipe.steps,
+        "description": recipe.description, "time": recipe.time, "level": recipe.level,
+    }
+    page = gr.build_html(recipe.title, recipe.ingredients, recipe.steps, recipe.description,
+                         lang=lang, time_text=recipe.time, level_text=recipe.level,
+                         hero_image=recipe.image, file_other=f"{name}_{other}.html",
+                         recipe_name=name, root_url="../", stylesheet=f"../css/recipe.{lang}.css")
+    print_page = gr.build_print(recipe.title, recipe.ingredients, recipe.steps, recipe.description,
+                                lang=lang, recipe_name=name, stylesheet=f"../css/print.{lang}.css")
+    return {
+        f"{path.stem}.json": json.dumps(parsed, ensure_ascii=False, indent=2) + "\n",
+        f"{path.stem}.html": page,
+        f"{path.stem}_print.html": print_page,
+    }
+
+
+def legacy_parse(text):
+    # הפרסור המקורי: extract_block נפרד לכל סקשן. parse_recipe_text חייב להחזיר בדיוק אותו דבר
+    title = text.replace("\r\n", "\n").replace("\r", "\n").splitlines()[0].strip()
+    ingredients = gr.extract_block(text, ["Ingredients", "מצרכים"],
+                                   ["Instructions", "אופן ההכנה", "Description", "תיאור"])
+    instructions = gr.extract_block(text, ["Instructions", "אופן ההכנה"],
+                                    ["Ingredients", "מצרכים", "Description", "תיאור"])
+    description = gr.extract_block(text, ["Description", "תיאור"],
+                                   ["Ingredients", "מצרכים", "Instructions", "אופן ההכנה"])
+    return title, gr.parse_list(ingredients), gr.parse_steps(instructions), description.strip()
+
+
+# -----------------------------
+# Throughput
+# -----------------------------
+def throughput_corpus():
+    rng = random.Random(1)
+    return [(lang, f"Recipe{i:06d}", bench_recipes.synthetic_recipe(rng, lang, i))
+            for i in range(THROUGHPUT_RECIPES) for lang in ("en", "he")]
+
+
+def measure_throughput(corpus):
+    # parse + render (מסך + הדפסה) בזיכרון, כמו שורת "parse + render" ב-bench; הטוב מבין כמה חזרות
+    best = float("inf")
+    for _ in range(THROUGHPUT_REPEATS):
+        started = time.perf_counter()
+        for lang, name, text in corpus:
+            t, ing, inst, desc = gr.parse_recipe_text(text)
+            gr.build_html(t, ing, inst, desc, lang=lang, recipe_name=name, stylesheet=f"css/recipe.{lang}.css")
+            gr.build_print(t, ing, inst, desc, lang=lang, recipe_name=name, stylesheet=f"css/print.{lang}.css")
+        best = min(best, time.perf_counter() - started)
+    # מתכון = זוג EN + HE, כמו ב-bench_recipes
+    return THROUGHPUT_RECIPES / best
+
+
+def update_golden():
+    for path in golden_cases():
+        for filename, text in render_case(path).items():
+            write_exact(EXPECTED_DIR / filename, text)
+    rate = measure_throughput(throughput_corpus())
+    baseline = {"recipes_per_sec": round(rate), "recipes": THROUGHPUT_RECIPES, "repeats": THROUGHPUT_REPEATS}
+    THROUGHPUT_FILE.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+    print(f"✅ golden files updated ({len(golden_cases())} cases, baseline {rate:.0f} recipes/s)")
+
+
+# -----------------------------
+# Tests
+# -----------------------------
+class GoldenCorpusTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if UPDATE:
+            update_golden()
+
+    def test_corpus_is_not_empty(self):
+        self.assertTrue(golden_cases())
+
+    def test_expected_output(self):
+        for path in golden_cases():
+            for filename, text in render_case(path).items():
+                with self.subTest(filename):
+                    expected = EXPECTED_DIR / filename
+                    self.assertTrue(expected.exists(), f"missing {expected.name}; run with --update")
+                    self.assertEqual(read_exact(expected), text)
+
+    def test_no_stale_expected_files(self):
+        produced = {name for path in golden_cases() for name in render_case(path)}
+        stale = sorted(p.name for p in EXPECTED_DIR.iterdir() if p.name not in produced)
+        self.assertEqual(stale, [])
+
+    def test_matches_legacy_parser(self):
+        for path in golden_cases():
+            with self.subTest(path.name):
+                text = path.read_bytes().decode("utf-8")
+                self.assertEqual(gr.parse_recipe_text(text), legacy_parse(text))
+
+    def test_cached_parse_matches(self):
+        # אותו פלט גם כשהפרסור מגיע מה-cache של load_recipe
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for path in golden_cases():
+                with self.subTest(path.name):
+                    fresh = gr.load_recipe(path, case_lang(path), cache_dir)
+                    cached = gr.load_recipe(path, case_lang(path), cache_dir)
+                    self.assertEqual(fresh, cached)
+
+
+class ThroughputTest(unittest.TestCase):
+    @unittest.skipIf(os.environ.get("GOLDEN_SKIP_THROUGHPUT") == "1", "GOLDEN_SKIP_THROUGHPUT=1")
+    def test_parse_render_throughput(self):
+        baseline = json.loads(THROUGHPUT_FILE.read_text(encoding="utf-8"))["recipes_per_sec"]
+        tolerance = float(os.environ.get("GOLDEN_THROUGHPUT_TOLERANCE", DEFAULT_TOLERANCE))
+        rate = measure_throughput(throughput_corpus())
+        self.assertGreaterEqual(
+            rate, baseline * tolerance,
+            f"parse + render: {rate:.0f} recipes/s, baseline {baseline} (minimum {baseline * tolerance:.0f})")
+
+
+if __name__ == "__main__":
+    if "--update" in sys.argv:
+        sys.argv.remove("--update")
+        UPDATE = True
+    unittest.main()
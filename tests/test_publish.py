@@ -0,0 +1,93 @@
+import contextlib
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate_recipe as gr  # noqa: E402
+
+# -----------------------------
+# publish מול remote מקומי (bare) - בלי רשת
+# -----------------------------
+SOURCES = ["Shnitzel_en.txt", "Shnitzel_he.txt", *gr.FLAG_FILES, ".gitignore"]
+
+
+def run_git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class PublishTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="recipe-publish-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.remote = self.tmp / "remote.git"
+        self.book = self.tmp / "book"
+        self.book.mkdir()
+        for name in SOURCES:
+            shutil.copyfile(ROOT / name, self.book / name)
+        run_git("init", "--quiet", "--bare", str(self.remote), cwd=self.tmp)
+        run_git("init", "--quiet", "-b", "main", cwd=self.book)
+        run_git("config", "user.name", "Cookbook Test", cwd=self.book)
+        run_git("config", "user.email", "test@example.com", cwd=self.book)
+        run_git("remote", "add", "origin", str(self.remote), cwd=self.book)
+
+    def publish(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return gr.publish(self.book, remote="origin", branch="main", jobs=1)
+
+    def remote_head(self):
+        return run_git("--git-dir", str(self.remote), "rev-parse", "main", cwd=self.tmp)
+
+    def assert_clean(self):
+        self.assertEqual(run_git("status", "--porcelain", "--untracked-files=no", cwd=self.book), "")
+
+    def test_second_publish_makes_no_commit(self):
+        self.assertTrue(self.publish())
+        head = self.remote_head()
+        self.assertEqual(head, run_git("rev-parse", "HEAD", cwd=self.book))
+        committed = run_git("ls-tree", "-r", "--name-only", "HEAD", cwd=self.book).splitlines()
+        self.assertIn("Shnitzel_en.html", committed)
+        self.assertIn("index.html", committed)
+
+        self.assertFalse(self.publish())
+        self.assertEqual(self.remote_head(), head)
+        self.assert_clean()
+
+    def test_failed_push_is_retried(self):
+        run_git("remote", "set-url", "origin", str(self.tmp / "missing.git"), cwd=self.book)
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.publish()
+        local = run_git("rev-parse", "HEAD", cwd=self.book)
+
+        # אין מה לעשות commit, אבל ה-commit הקודם עדיין צריך להגיע ל-remote
+        run_git("remote", "set-url", "origin", str(self.remote), cwd=self.book)
+        self.assertFalse(self.publish())
+        self.assertEqual(self.remote_head(), local)
+
+    def test_pages_written_outside_build_all_are_published(self):
+        # כמו watch: build_recipe כותב את הדפים, ה-build של publish מוצא אותם בלי שינוי בבייטים
+        self.assertTrue(self.publish())
+        source = self.book / "Shnitzel_en.txt"
+        source.write_bytes(source.read_bytes() + b"\r\nServe with lemon wedges.\r\n")
+        stylesheets = gr.write_stylesheets(self.book, prune=False, report=gr.OutputReport())
+        with contextlib.redirect_stdout(io.StringIO()):
+            gr.build_recipe(self.book, "Shnitzel", self.book, stylesheets, langs=["en"],
+                            flags=gr.store_flags(self.book))
+
+        self.assertTrue(self.publish())
+        changed = run_git("show", "--name-only", "--format=", "HEAD", cwd=self.book).splitlines()
+        self.assertIn("Shnitzel_en.txt", changed)
+        self.assertIn("Shnitzel_en.html", changed)
+        self.assert_clean()
+        self.assertEqual(self.remote_head(), run_git("rev-parse", "HEAD", cwd=self.book))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate_recipe as gr  # noqa: E402
+
+# -----------------------------
+# זמנים: אותו פרסור לזמן של מתכון ולזמן בשאילתה
+# -----------------------------
+TIMES = [
+    ("45 minutes", 45),
+    ("20 mins", 20),
+    ("1 hour 15 minutes", 75),
+    ("1.5 hours", 90),
+    ("1h30m", 90),
+    ("1h 30m", 90),
+    ("2h", 120),
+    ("90m", 90),
+    ("30–45 דקות", 45),
+    ("45 דקות", 45),
+    ("2 שעות", 120),
+    ("שעה", 60),
+    ("שעה וחצי", 90),
+    ("שעה ו-20 דקות", 80),
+    ("שעתיים", 120),
+    ("Easy", None),
+]
+
+# (שאילתה, מילים, מקסימום דקות)
+QUERIES = [
+    ("recipes with eggs and panko under 45 minutes", ["eggs", "panko"], 45),
+    ("under 45 minutes panko", ["panko"], 45),
+    ("panko in 1h30m", ["panko"], 90),
+    ("eggs under 1 hour 30 minutes", ["eggs"], 90),
+    ("eggs under 1 hour and 30 minutes", ["eggs"], 90),
+    ("eggs in 20 minutes", ["eggs"], 20),
+    ("within 2 hours", [], 120),
+    ("up to 1.5 hours", [], 90),
+    ("<= 30 min", [], 30),
+    ("under 45", [], 45),
+    ("שקשוקה בתוך שעה", ["שקשוקה"], 60),
+    ("עוף עד שעתיים וחצי", [gr.normalize_search_text("עוף")], 150),
+    ("עוף עד 30 דקות", [gr.normalize_search_text("עוף")], 30),
+    ("עד שעה ו-20 דקות", [], 80),
+]
+
+
+class TimeMinutesTest(unittest.TestCase):
+    def test_time_minutes(self):
+        for text, minutes in TIMES:
+            with self.subTest(text):
+                self.assertEqual(gr.time_minutes(text), minutes)
+
+
+class ParseQueryTest(unittest.TestCase):
+    def test_parse_query(self):
+        for text, terms, minutes in QUERIES:
+            with self.subTest(text):
+                self.assertEqual(gr.parse_query(text), (terms, minutes))
+
+    def test_prefix_needs_word_boundary(self):
+        # "rais-in 20 minutes" / "cab-in 2 hours" הם לא הגבלת זמן
+        for text, word in (("raisin 20 minutes", "raisin"), ("cabin 2 hours", "cabin")):
+            with self.subTest(text):
+                terms, minutes = gr.parse_query(text)
+                self.assertIsNone(minutes)
+                self.assertIn(word, terms)
+
+
+class QueryCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp(prefix="recipe-catalog-"))
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        for name in ("Shnitzel_en.txt", "Shnitzel_he.txt"):
+            shutil.copyfile(ROOT / name, self.root / name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            gr.update_catalog(self.root, gr.find_recipes(self.root), gr.FileHasher({}, self.root))
+
+    def titles(self, text):
+        return [title for title, *_ in gr.query_catalog(self.root, text)]
+
+    def test_time_limit(self):
+        # ברירת המחדל של המתכון היא 45 דקות
+        self.assertEqual(len(self.titles("panko in 1h30m")), 1)
+        self.assertEqual(len(self.titles("panko under 1 hour 30 minutes")), 1)
+        self.assertEqual(self.titles("panko in 30 minutes"), [])
+
+    def test_hebrew_query(self):
+        self.assertEqual(len(self.titles("שניצל עד שעה")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,24 +6,13 @@
 REPO_DIR="$HOME/.local/share/Cookbook"   # נתיב למיקום הפרויקט שלך ב‑WSL
 PYTHON_SCRIPT="generate_recipe.py"         # השם של הסקריפט שלך
 COMMIT_MSG="Update recipes HTML + images"
+BRANCH="main"                              # אם הסניף שלך שונה מ-main, שנה בהתאם
 
 # -----------------------------
-# Run Python script
+# Build + git add (רק מה שהשתנה) + commit + push
 # -----------------------------
-echo "🚀 Running Python script..."
-python3 "$REPO_DIR/$PYTHON_SCRIPT"
-
-# -----------------------------
-# Git add & commit & push
-# -----------------------------
-cd "$REPO_DIR" || exit
-echo "📦 Adding changes to git..."
-git add .
-
-echo "✏️ Committing changes..."
-git commit -m "$COMMIT_MSG"
-
-echo "📤 Pushing to GitHub..."
-git push origin main   # אם הסניף שלך שונה מ-main, שנה בהתאם
+echo "🚀 Building and publishing..."
+# -m (ולא נתיב לקובץ) כדי שפייתון ישתמש ב-bytecode השמור ב-__pycache__
+PYTHONPATH="$REPO_DIR" python3 -m "${PYTHON_SCRIPT%.py}" publish --root "$REPO_DIR" -m "$COMMIT_MSG" --branch "$BRANCH" || exit 1
 
 echo "✅ Done! All updates pushed to GitHub."